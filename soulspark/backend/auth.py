@@ -1,22 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import jwt
-from fastapi import Depends, HTTPException
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from google.oauth2 import id_token
-from google.auth.transport import requests as grequests
+from pydantic import BaseModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .database import get_session
+from .database import get_async_session
 from .models.user import User
+from .utils.cache import TTLCache
+from .utils.google_certs import get_certs_request
 
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change")
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "43200"))  # 30 days
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 
+# Resolved users by id, so authenticated requests skip the users-table lookup.
+# Entries are detached copies; login/issue invalidate them on update.
+_USER_CACHE = TTLCache(
+    max_entries=int(os.getenv("AUTH_USER_CACHE_SIZE", "4096")),
+    ttl_seconds=float(os.getenv("AUTH_USER_CACHE_TTL", "300")),
+)
+
 
 def create_access_token(sub: str, data: dict) -> str:
     now = datetime.now(tz=timezone.utc)
@@ -24,10 +35,21 @@ def create_access_token(sub: str, data: dict) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
 
 
-def verify_google_id_token(token: str) -> dict:
+def _verify_google_id_token_sync(token: str) -> dict:
+    certs = get_certs_request()
+    try:
+        return id_token.verify_oauth2_token(token, certs, GOOGLE_CLIENT_ID or None)
+    except Exception as e:
+        # An unknown key id usually means Google rotated keys; refetch once
+        if "key" not in str(e).lower() or not certs.invalidate(min_age=60.0):
+            raise
+        return id_token.verify_oauth2_token(token, certs, GOOGLE_CLIENT_ID or None)
+
+
+async def verify_google_id_token(token: str) -> dict:
+    """Verify a Google ID token off the event loop using cached signing certs."""
     try:
-        info = id_token.verify_oauth2_token(token, grequests.Request(), GOOGLE_CLIENT_ID or None)
-        return info
+        return await asyncio.to_thread(_verify_google_id_token_sync, token)
     except Exception as e:  # pragma: no cover - network validation
         raise HTTPException(status_code=401, detail="Invalid Google token") from e
 
@@ -35,19 +57,63 @@ def verify_google_id_token(token: str) -> dict:
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
-def get_current_user(creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> User:
+class UserClaims(BaseModel):
+    """Identity taken straight from a verified access token."""
+
+    id: int
+    email: Optional[str] = None
+
+
+def _decode_claims(creds: Optional[HTTPAuthorizationCredentials]) -> UserClaims:
     if not creds:
         raise HTTPException(status_code=401, detail="Not authenticated")
     try:
         payload = jwt.decode(creds.credentials, JWT_SECRET, algorithms=["HS256"])
-        uid = int(payload.get("uid"))
+        return UserClaims(id=int(payload.get("uid")), email=payload.get("email"))
     except Exception as e:  # pragma: no cover
         raise HTTPException(status_code=401, detail="Invalid token") from e
 
-    from .database import Session, engine  # local import to avoid circular
-    with get_session() as session:
-        user = session.get(User, uid)
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
 
+def invalidate_user_cache(uid: Optional[int]) -> None:
+    if uid is not None:
+        _USER_CACHE.delete(uid)
+
+
+def user_cache_stats() -> dict:
+    return _USER_CACHE.stats()
+
+
+async def _resolve_user(uid: int, session: AsyncSession) -> User:
+    cached = _USER_CACHE.get(uid)
+    if cached is not None:
+        return cached
+    user = await session.get(User, uid)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    detached = User(**user.model_dump())
+    _USER_CACHE.set(uid, detached)
+    return detached
+
+
+async def get_current_user_claims(
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    session: AsyncSession = Depends(get_async_session),
+) -> UserClaims:
+    """Auth for routes that just need the user id.
+
+    Confirms the user still exists (through the user cache), so tokens of
+    deleted users get 401. AUTH_CLAIMS_ONLY=1 opts into trusting the signed
+    token's ``uid``/``email`` without that lookup.
+    """
+    claims = _decode_claims(creds)
+    if os.getenv("AUTH_CLAIMS_ONLY", "0").lower() in ("1", "true", "yes"):
+        return claims
+    user = await _resolve_user(claims.id, session)
+    return UserClaims(id=user.id, email=user.email)
+
+
+def require_admin_secret(x_admin_secret: str = Header(default="")) -> None:
+    """Guard for admin routes: `X-Admin-Secret` must match `TOKEN_ISSUER_SECRET`."""
+    admin_secret = os.getenv("TOKEN_ISSUER_SECRET", "")
+    if not admin_secret or x_admin_secret != admin_secret:
+        raise HTTPException(status_code=403, detail="Forbidden")
@@ -0,0 +1,93 @@
+"""Local stand-in for the OurManna verse API, for exercising outages.
+
+    python -m soulspark.backend.bench.bible_standin --port 8765 --mode flaky
+    BIBLE_API_URL=http://127.0.0.1:8765/ uvicorn soulspark.backend.main:app
+
+Modes: ``ok`` answers immediately, ``slow`` sleeps ``--delay`` seconds first,
+``error`` always returns 503, ``flaky`` fails ``--fail-rate`` of requests and
+``down`` drops connections without answering. POST /mode?m=<mode> switches
+mode while running.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+VERSES = [
+    "The LORD is my shepherd; I shall not want. - Psalm 23:1",
+    "Be still, and know that I am God. - Psalm 46:10",
+    "Cast all your anxiety on him because he cares for you. - 1 Peter 5:7",
+]
+
+
+def _handler(state: dict):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802
+            state["requests"] += 1
+            mode = state["mode"]
+            if mode == "down":
+                self.close_connection = True
+                return
+            if mode == "slow":
+                time.sleep(state["delay"])
+            if mode == "error" or (mode == "flaky" and random.random() < state["fail_rate"]):
+                self._send(503, "unavailable")
+                return
+            self._send(200, random.choice(VERSES))
+
+        def do_POST(self) -> None:  # noqa: N802
+            url = urlparse(self.path)
+            if url.path == "/mode":
+                state["mode"] = parse_qs(url.query).get("m", [state["mode"]])[0]
+                self._send(200, state["mode"])
+            else:
+                self._send(404, "not found")
+
+        def log_message(self, fmt: str, *args) -> None:
+            if state["verbose"]:
+                super().log_message(fmt, *args)
+
+    return Handler
+
+
+def serve(port: int = 8765, mode: str = "ok", delay: float = 10.0, fail_rate: float = 0.5, verbose: bool = False):
+    """Start the stand-in on a background thread; returns (server, state)."""
+    import threading
+
+    state = {"mode": mode, "delay": delay, "fail_rate": fail_rate, "verbose": verbose, "requests": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mode", choices=["ok", "slow", "error", "flaky", "down"], default="ok")
+    parser.add_argument("--delay", type=float, default=10.0)
+    parser.add_argument("--fail-rate", type=float, default=0.5)
+    args = parser.parse_args()
+    server, _ = serve(args.port, args.mode, args.delay, args.fail_rate, verbose=True)
+    print(f"Serving stand-in Bible API on http://127.0.0.1:{args.port}/ (mode={args.mode})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
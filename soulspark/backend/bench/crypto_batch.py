@@ -0,0 +1,48 @@
+"""Compare serial decrypt_text against decrypt_many on a synthetic journal.
+
+    python -m soulspark.backend.bench.crypto_batch --entries 5000
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import random
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--min-chars", type=int, default=300)
+    parser.add_argument("--max-chars", type=int, default=4000)
+    args = parser.parse_args()
+
+    # A raw 32-byte key keeps the KDF out of the measurement
+    os.environ.setdefault("JOURNAL_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode("ascii"))
+    from ..utils import crypto
+
+    words = "grace peace hope prayer morning anxious grateful rest strength faith today".split()
+    texts = [
+        " ".join(random.choice(words) for _ in range(random.randint(args.min_chars, args.max_chars) // 7))
+        for _ in range(args.entries)
+    ]
+    tokens = crypto.encrypt_many(texts)
+
+    start = time.perf_counter()
+    serial = [crypto.decrypt_text(t) for t in tokens]
+    t_serial = time.perf_counter() - start
+
+    crypto.decrypt_many(tokens[:100])  # spin up the pool outside the timing
+    start = time.perf_counter()
+    batched = crypto.decrypt_many(tokens)
+    t_batched = time.perf_counter() - start
+
+    assert serial == batched == texts
+    print(f"entries={args.entries} workers={crypto.CRYPTO_WORKERS}")
+    print(f"serial decrypt_text: {t_serial * 1000:8.1f} ms")
+    print(f"decrypt_many:        {t_batched * 1000:8.1f} ms  ({t_serial / t_batched:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
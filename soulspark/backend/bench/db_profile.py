@@ -0,0 +1,101 @@
+"""Compare journal read/write throughput under the "plain" and "tuned" DB profiles.
+
+Seeds a temporary SQLite journal DB per profile, then runs concurrent
+readers and writers against the async engine for a fixed duration.
+
+    python -m soulspark.backend.bench.db_profile --entries 5000 --workers 32 --seconds 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..database import build_async_engine, build_engine
+from ..models.journal import JournalEntry
+from ..models.user import User
+
+
+def _seed(path: str, entries: int, users: int) -> None:
+    eng = build_engine(f"sqlite:///{path}", profile="plain")
+    # journalentry.user_id references user.id, so both tables are needed
+    SQLModel.metadata.create_all(eng, tables=[User.__table__, JournalEntry.__table__])
+    now = datetime.now(timezone.utc)
+    with Session(eng) as session:
+        for i in range(entries):
+            session.add(
+                JournalEntry(
+                    user_id=1 + i % users,
+                    content="x" * random.randint(200, 2000),
+                    created_at=now - timedelta(minutes=i),
+                    title=f"Entry {i}",
+                )
+            )
+        session.commit()
+    eng.dispose()
+
+
+async def _run(path: str, profile: str, workers: int, seconds: float, users: int, write_ratio: float) -> dict:
+    eng = build_async_engine(f"sqlite+aiosqlite:///{path}", profile=profile)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    deadline = time.perf_counter() + seconds
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            uid = random.randint(1, users)
+            try:
+                async with AsyncSession(eng, expire_on_commit=False) as session:
+                    if random.random() < write_ratio:
+                        session.add(JournalEntry(user_id=uid, content="y" * 500, title="bench"))
+                        await session.commit()
+                        counts["writes"] += 1
+                    else:
+                        stmt = (
+                            select(JournalEntry)
+                            .where(JournalEntry.user_id == uid)
+                            .order_by(JournalEntry.created_at.desc())
+                            .limit(50)
+                        )
+                        (await session.exec(stmt)).all()
+                        counts["reads"] += 1
+            except OperationalError:
+                counts["errors"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(workers)])
+    elapsed = time.perf_counter() - start
+    await eng.dispose()
+    total = counts["reads"] + counts["writes"]
+    return {"profile": profile, "ops_per_s": round(total / elapsed, 1), **counts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("plain", "tuned"):
+            path = os.path.join(tmp, f"{profile}.db")
+            _seed(path, args.entries, args.users)
+            res = asyncio.run(_run(path, profile, args.workers, args.seconds, args.users, args.write_ratio))
+            print(
+                f"{res['profile']:>6}: {res['ops_per_s']:>8} ops/s  "
+                f"reads={res['reads']} writes={res['writes']} locked_errors={res['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare POST /journal one entry at a time against /journal/batch and /journal/import.
+
+    python -m soulspark.backend.bench.journal_import --entries 2000
+
+Runs the app in-process (TestClient) on a scratch SQLite database, so the
+numbers include validation, encryption, indexing and commits but no network.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import random
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--min-chars", type=int, default=200)
+    parser.add_argument("--max-chars", type=int, default=700)
+    args = parser.parse_args()
+
+    d = tempfile.mkdtemp()
+    os.environ["SOULSPARK_DB_PATH"] = f"sqlite:///{d}/bench.db"
+    os.environ.setdefault("JOURNAL_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode("ascii"))
+    os.environ.setdefault("JWT_SECRET", "bench")
+    # Keep background summaries out of the measurement
+    os.environ["ENTRY_SUMMARY_MIN_CHARS"] = str(10**9)
+
+    from fastapi.testclient import TestClient
+
+    from ..auth import create_access_token
+    from ..database import init_db
+    from ..main import app
+
+    init_db()
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(sub='1', data={'uid': 1, 'email': 'bench@example.com'})}"}
+
+    words = "grace peace hope prayer morning anxious grateful rest strength faith today family work".split()
+    items = [
+        {
+            "content": " ".join(random.choice(words) for _ in range(random.randint(args.min_chars, args.max_chars) // 7)),
+            "title": f"Entry {i}",
+            "mood": random.choice(["calm", "anxious", "grateful", None]),
+        }
+        for i in range(args.entries)
+    ]
+
+    start = time.perf_counter()
+    for item in items:
+        assert client.post("/journal", json=item, headers=headers).status_code == 200
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(items), 1000):
+        r = client.post("/journal/batch", json=items[i : i + 1000], headers=headers)
+        assert r.status_code == 200 and r.json()["failed"] == 0, r.text[:500]
+    t_batch = time.perf_counter() - start
+
+    body = "\n".join(json.dumps(item) for item in items).encode("utf-8")
+    start = time.perf_counter()
+    r = client.post("/journal/import", content=body, headers={**headers, "Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200 and r.json()["failed"] == 0, r.text[:500]
+    t_import = time.perf_counter() - start
+
+    n = len(items)
+    print(f"entries={n}")
+    print(f"POST /journal x{n}:  {t_single:7.2f} s  {n / t_single:8.0f} entries/s")
+    print(f"POST /journal/batch: {t_batch:7.2f} s  {n / t_batch:8.0f} entries/s  ({t_single / t_batch:.1f}x)")
+    print(f"POST /journal/import:{t_import:7.2f} s  {n / t_import:8.0f} entries/s  ({t_single / t_import:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Compare on-disk size of enc2 (no compression) and enc3 journal tokens.
+
+    python -m soulspark.backend.bench.storage_size --entries 5000
+
+Builds a synthetic journal of prose-like entries, encrypts it under each
+setting, writes the tokens to a scratch SQLite table and reports the bytes
+stored, the database file size and encrypt/decrypt time. ``--dict-from``
+trains a shared zlib dictionary on the first N entries (stored outside the
+measured corpus, like ``JOURNAL_COMPRESS_DICT`` in production).
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+_OPENERS = [
+    "This morning I woke up feeling {mood}.",
+    "Today was {adj}, and I keep thinking about {topic}.",
+    "I spent some quiet time in prayer before work.",
+    "Tonight I want to write down what happened with {topic}.",
+    "I read {book} {chapter}:{verse} again and it stayed with me.",
+]
+_MIDDLES = [
+    "I noticed how {mood} I get when {topic} comes up, and I tried to slow down and breathe.",
+    "My {person} called and we talked for a long time about {topic}.",
+    "There was a moment at lunch where I felt {mood}, but it passed when I remembered to be grateful.",
+    "I am learning that rest is not laziness, and that {topic} does not define me.",
+    "Work was {adj}; the meeting ran long and I felt {mood} afterwards.",
+    "I went for a walk in the park and the weather was {adj}.",
+    "I keep asking God for patience with {topic} and for wisdom with my {person}.",
+]
+_CLOSERS = [
+    "Tomorrow I want to be more patient and kind.",
+    "I am grateful for small things: coffee, sunlight, a kind word.",
+    "Lord, help me trust you with {topic}.",
+    "Going to bed early tonight.",
+]
+_FILL = {
+    "mood": "anxious tired hopeful grateful calm restless joyful overwhelmed peaceful lonely".split(),
+    "adj": "long busy slow bright rainy hard gentle ordinary beautiful exhausting".split(),
+    "topic": ["my job", "the move", "money", "my health", "church", "the kids", "school", "my future", "friendships"],
+    "person": "mom dad sister brother friend pastor manager husband wife".split(),
+    "book": "Psalm Isaiah Matthew John Romans Philippians Proverbs".split(),
+}
+
+
+def _sentence(template: str, rng: random.Random) -> str:
+    return template.format(
+        chapter=rng.randint(1, 50), verse=rng.randint(1, 30), **{k: rng.choice(v) for k, v in _FILL.items()}
+    )
+
+
+def _entry(rng: random.Random, min_chars: int, max_chars: int) -> str:
+    target = rng.randint(min_chars, max_chars)
+    parts = [_sentence(rng.choice(_OPENERS), rng)]
+    while sum(len(p) + 1 for p in parts) < target:
+        parts.append(_sentence(rng.choice(_MIDDLES), rng))
+    parts.append(_sentence(rng.choice(_CLOSERS), rng))
+    return " ".join(parts)
+
+
+def _train_zlib_dict(samples: List[str], size: int = 16 * 1024) -> bytes:
+    # zlib dictionaries favour their tail, so the most common phrases go last
+    counts = Counter(s for text in samples for s in text.split(". "))
+    phrases = [p for p, _ in counts.most_common()][::-1]
+    return ". ".join(phrases).encode("utf-8")[-size:]
+
+
+def _measure(name: str, texts: List[str], env: Dict[str, Optional[str]]) -> None:
+    from ..utils import crypto
+
+    for key, value in env.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    crypto._COMPRESSOR = None
+
+    start = time.perf_counter()
+    tokens = [crypto.encrypt_text(t) for t in texts]
+    t_enc = time.perf_counter() - start
+    start = time.perf_counter()
+    plain = [crypto.decrypt_text(t) for t in tokens]
+    t_dec = time.perf_counter() - start
+    assert plain == texts
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "bench.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE journalentry (id INTEGER PRIMARY KEY, content TEXT)")
+        conn.executemany("INSERT INTO journalentry (content) VALUES (?)", [(t,) for t in tokens])
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        db_bytes = os.path.getsize(path)
+
+    stored = sum(len(t) for t in tokens)
+    raw = sum(len(t.encode("utf-8")) for t in texts)
+    enc3 = sum(1 for t in tokens if t.startswith("enc3:"))
+    print(
+        f"{name:<14} stored={stored / 1e6:7.2f} MB ({stored / raw:.2f}x plaintext)  "
+        f"db={db_bytes / 1e6:7.2f} MB  enc3={enc3}/{len(tokens)}  "
+        f"encrypt={t_enc * 1000:7.1f} ms  decrypt={t_dec * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--min-chars", type=int, default=80)
+    parser.add_argument("--max-chars", type=int, default=4000)
+    parser.add_argument("--dict-from", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # A raw 32-byte key keeps the KDF out of the measurement
+    os.environ.setdefault("JOURNAL_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode("ascii"))
+    rng = random.Random(args.seed)
+    training = [_entry(rng, args.min_chars, args.max_chars) for _ in range(args.dict_from)]
+    texts = [_entry(rng, args.min_chars, args.max_chars) for _ in range(args.entries)]
+
+    raw = sum(len(t.encode("utf-8")) for t in texts)
+    print(f"entries={len(texts)} plaintext={raw / 1e6:.2f} MB")
+    base = {"JOURNAL_COMPRESS_DICT": None, "JOURNAL_COMPRESS_LEVEL": None}
+    _measure("enc2 (off)", texts, {**base, "JOURNAL_COMPRESS": "off"})
+    _measure("enc3 zlib", texts, {**base, "JOURNAL_COMPRESS": "zlib"})
+
+    with tempfile.NamedTemporaryFile(suffix=".dict", delete=False) as fh:
+        fh.write(_train_zlib_dict(training))
+    try:
+        _measure("enc3 zlib+dict", texts, {**base, "JOURNAL_COMPRESS": "zlib", "JOURNAL_COMPRESS_DICT": fh.name})
+    finally:
+        os.unlink(fh.name)
+
+    from ..utils import crypto
+
+    if crypto.zstandard is not None:
+        _measure("enc3 zstd", texts, {**base, "JOURNAL_COMPRESS": "zstd"})
+
+
+if __name__ == "__main__":
+    main()
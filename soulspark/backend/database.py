@@ -1,14 +1,114 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, AsyncIterator, Dict, Iterator
 
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 import os
 
 DB_PATH = os.getenv("SOULSPARK_DB_PATH", "sqlite:///./soulspark.db")
-connect_args = {"check_same_thread": False} if DB_PATH.startswith("sqlite") else {}
-engine = create_engine(DB_PATH, echo=False, connect_args=connect_args)
+# "tuned" applies the pool and SQLite settings below; "plain" uses driver defaults
+DB_PROFILE = os.getenv("SOULSPARK_DB_PROFILE", "tuned")
+
+
+def _async_url(url: str) -> str:
+    """Map the configured sync URL onto its async driver (aiosqlite / psycopg)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    return url
+
+
+def _sqlite_pragmas() -> Dict[str, str]:
+    return {
+        # WAL lets readers proceed while a writer holds the lock
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        # Wait for the write lock instead of failing with "database is locked"
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        # Negative values are KiB: -65536 = 64 MiB page cache per connection
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+        "temp_store": "MEMORY",
+    }
+
+
+def _install_sqlite_pragmas(sync_engine: Engine) -> None:
+    pragmas = _sqlite_pragmas()
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:  # pragma: no cover - driver hook
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _engine_kwargs(url: str, profile: str) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {}
+    if url.startswith("sqlite") and not url.startswith("sqlite+aiosqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if profile != "tuned" or ":memory:" in url:
+        return kwargs
+    kwargs.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    )
+    if not url.startswith("sqlite"):
+        # Drop connections the server or a proxy may have closed
+        kwargs.update(pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")), pool_pre_ping=True)
+    return kwargs
+
+
+def build_engine(url: str, profile: str = DB_PROFILE) -> Engine:
+    eng = create_engine(url, echo=False, **_engine_kwargs(url, profile))
+    if url.startswith("sqlite") and profile == "tuned":
+        _install_sqlite_pragmas(eng)
+    return eng
+
+
+def build_async_engine(url: str, profile: str = DB_PROFILE) -> AsyncEngine:
+    eng = create_async_engine(url, echo=False, **_engine_kwargs(url, profile))
+    if url.startswith("sqlite") and profile == "tuned":
+        _install_sqlite_pragmas(eng.sync_engine)
+    return eng
+
+
+engine = build_engine(DB_PATH)
+
+# Request handlers use the async engine so DB I/O does not block the event
+# loop; the sync engine above remains for startup migrations and scripts.
+ASYNC_DB_URL = os.getenv("SOULSPARK_ASYNC_DB_URL") or _async_url(DB_PATH)
+async_engine = build_async_engine(ASYNC_DB_URL)
+async_session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _pool_stats(eng: Engine) -> Dict[str, Any]:
+    pool = eng.pool
+    out: Dict[str, Any] = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            out[name] = fn()
+    return out
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool counters for the health endpoint."""
+    return {
+        "profile": DB_PROFILE,
+        "sync": _pool_stats(engine),
+        "async": _pool_stats(async_engine.sync_engine),
+    }
 
 
 def init_db() -> None:
@@ -17,6 +117,8 @@ def init_db() -> None:
     # Lightweight, safe migrations for SQLite
     if DB_PATH.startswith("sqlite"):
         _sqlite_safe_migrations()
+    _add_missing_columns()
+    _index_migrations()
 
 
 @contextmanager
@@ -25,6 +127,17 @@ def get_session() -> Iterator[Session]:
         yield session
 
 
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency yielding one AsyncSession per request."""
+    async with async_session_maker() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    await async_engine.dispose()
+    engine.dispose()
+
+
 def _sqlite_safe_migrations() -> None:
     """Run minimal migrations for existing local SQLite DBs.
 
@@ -49,3 +162,46 @@ def _sqlite_safe_migrations() -> None:
     except Exception:
         # Best-effort; if this fails we don't block startup
         pass
+
+
+# Columns added to existing tables after their first release: table -> {column: DDL type}
+_ADDED_COLUMNS = {
+    "journalentry": {"preview": "TEXT", "content_length": "INTEGER", "term_count": "INTEGER", "summary": "TEXT"},
+    "jobcheckpoint": {"skipped": "INTEGER NOT NULL DEFAULT 0", "owner": "TEXT", "heartbeat": "TIMESTAMP"},
+}
+
+
+def _add_missing_columns() -> None:
+    """Add newer nullable columns to tables created by older releases."""
+    try:
+        insp = inspect(engine)
+        for table, columns in _ADDED_COLUMNS.items():
+            if not insp.has_table(table):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table)}
+            for name, ddl_type in columns.items():
+                if name not in existing:
+                    with engine.begin() as conn:
+                        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl_type}")
+    except Exception:
+        # Best-effort; if this fails we don't block startup
+        pass
+
+
+def _index_migrations() -> None:
+    """Create indexes added after a table already existed (SQLite and Postgres).
+
+    ``create_all`` only builds indexes together with new tables, so existing
+    databases pick them up here.
+    """
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_journalentry_user_created_id "
+        "ON journalentry (user_id, created_at DESC, id)",
+    ]
+    for stmt in statements:
+        try:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(stmt)
+        except Exception:
+            # Best-effort; a missing index only costs speed
+            pass
@@ -0,0 +1,252 @@
+"""Background re-encryption of journal entries across all users.
+
+Walks ``journalentry`` by id in fixed-size batches, each in its own short
+transaction, and rewrites any ``content``/``preview``/``summary`` not already
+sealed with the active key (plaintext, Fernet, ``enc1`` or an older key id).
+The last processed id is committed with every batch, so a paused, failed or
+interrupted run resumes where it stopped.
+
+Rows are read, re-encrypted off the event loop and written back with a
+conditional UPDATE that only matches if the fields still hold the tokens
+that were read; a row a user saved in between is left alone and counted as
+skipped (their write already used the active key).
+
+With several workers only one runs the job: it holds a lease on the
+checkpoint row (``owner`` + ``heartbeat``, renewed every batch), and the
+others take over only once the heartbeat is older than JOB_LEASE_SECONDS.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from ..database import async_session_maker
+from ..models.job import JobCheckpoint
+from ..models.journal import JournalEntry
+from ..utils.crypto import KEYS, adecrypt_many, aencrypt_many, is_probably_encrypted, token_key_id
+
+JOB_NAME = "reencrypt"
+_FIELDS = ("content", "preview", "summary")
+
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Identifies this worker process in JobCheckpoint.owner
+_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_TASK: Optional["asyncio.Task[None]"] = None
+
+
+def is_running() -> bool:
+    return _TASK is not None and not _TASK.done()
+
+
+async def _get_checkpoint(session) -> Optional[JobCheckpoint]:
+    return (await session.exec(select(JobCheckpoint).where(JobCheckpoint.name == JOB_NAME))).first()
+
+
+async def _claim(session) -> bool:
+    """Take the job's lease if it is free, ours, or its holder stopped heartbeating."""
+    now = datetime.now(timezone.utc)
+    result = await session.exec(
+        update(JobCheckpoint)
+        .where(
+            JobCheckpoint.name == JOB_NAME,
+            or_(
+                JobCheckpoint.owner.is_(None),
+                JobCheckpoint.owner == _OWNER,
+                JobCheckpoint.heartbeat.is_(None),
+                JobCheckpoint.heartbeat < now - timedelta(seconds=JOB_LEASE_SECONDS),
+            ),
+        )
+        .values(owner=_OWNER, heartbeat=now)
+    )
+    await session.commit()
+    return bool(result.rowcount)
+
+
+async def get_status() -> Dict[str, object]:
+    async with async_session_maker() as session:
+        cp = await _get_checkpoint(session)
+    out: Dict[str, object] = cp.model_dump() if cp else {"name": JOB_NAME, "status": "idle"}
+    out["running"] = is_running()
+    return out
+
+
+def _needs_rewrite(value: Optional[str], target_kid: str) -> bool:
+    return bool(value) and token_key_id(value) != target_kid
+
+
+Row = Tuple[Any, ...]  # (id, *_FIELDS)
+
+
+async def _process_batch(rows: List[Row], target_kid: str) -> Tuple[Dict[int, Dict[str, str]], int]:
+    """Re-encrypt stale fields; returns ({id: {field: new token}}, failed fields)."""
+    pending = [(r, n, f) for r in rows for n, f in enumerate(_FIELDS, 1) if _needs_rewrite(r[n], target_kid)]
+    if not pending:
+        return {}, 0
+    old = [r[n] for r, n, _ in pending]
+    plain = await adecrypt_many(old)
+    # decrypt_text hands back the token unchanged when no key opens it;
+    # re-encrypting that would bury the original ciphertext
+    ok = [(r, f, p) for (r, _, f), o, p in zip(pending, old, plain) if not (is_probably_encrypted(o) and p == o)]
+    sealed = await aencrypt_many([p for _, _, p in ok])
+    changes: Dict[int, Dict[str, str]] = {}
+    for (r, f, _), token in zip(ok, sealed):
+        changes.setdefault(r[0], {})[f] = token
+    return changes, len(pending) - len(ok)
+
+
+async def _write_back(session, rows: List[Row], changes: Dict[int, Dict[str, str]]) -> Tuple[int, int]:
+    """Apply ``changes`` only to rows still holding what was read; (updated, skipped)."""
+    updated = skipped = 0
+    for r in rows:
+        values = changes.get(r[0])
+        if not values:
+            continue
+        unchanged = [
+            getattr(JournalEntry, f).is_(None) if v is None else getattr(JournalEntry, f) == v
+            for f, v in zip(_FIELDS, r[1:])
+        ]
+        result = await session.exec(update(JournalEntry).where(JournalEntry.id == r[0], *unchanged).values(**values))
+        if result.rowcount:
+            updated += 1
+        else:
+            skipped += 1
+    return updated, skipped
+
+
+async def _run(batch_size: int, max_rows_per_sec: float) -> None:
+    while True:
+        started = time.perf_counter()
+        async with async_session_maker() as session:
+            cp = await _get_checkpoint(session)
+            if cp is None or cp.status != "running" or cp.owner != _OWNER:
+                return
+            try:
+                rows = list(
+                    (
+                        await session.exec(
+                            select(JournalEntry.id, *(getattr(JournalEntry, f) for f in _FIELDS))
+                            .where(JournalEntry.id > cp.last_id)
+                            .order_by(JournalEntry.id)
+                            .limit(batch_size)
+                        )
+                    ).all()
+                )
+                now = datetime.now(timezone.utc)
+                if not rows:
+                    cp.status = "done"
+                    cp.finished_at = now
+                    cp.owner = None
+                else:
+                    changes, failed = await _process_batch(rows, cp.target_key_id or "")
+                    updated, skipped = await _write_back(session, rows, changes)
+                    cp.last_id = rows[-1][0]
+                    cp.scanned += len(rows)
+                    cp.updated += updated
+                    cp.skipped += skipped
+                    cp.failed += failed
+                cp.updated_at = cp.heartbeat = now
+                session.add(cp)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                cp.status = "failed"
+                cp.owner = None
+                cp.error = repr(e)
+                cp.updated_at = datetime.now(timezone.utc)
+                session.add(cp)
+                await session.commit()
+                return
+            if not rows:
+                return
+        if max_rows_per_sec > 0:
+            # Throttle so the job never monopolises the write lock
+            wait = len(rows) / max_rows_per_sec - (time.perf_counter() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+
+async def start(batch_size: int = 200, max_rows_per_sec: float = 500.0, restart: bool = False) -> Dict[str, object]:
+    """Start the job, or resume it from its checkpoint.
+
+    ``restart`` discards the checkpoint and walks every entry again. A
+    finished job also starts over, which picks up rows written by older key
+    ids since the last run. If another worker holds the lease this only
+    reports its progress.
+    """
+    global _TASK
+    if is_running():
+        return await get_status()
+    target_kid, aes = KEYS.active()
+    if target_kid is None or aes is None:
+        raise RuntimeError("No active AES-GCM key configured")
+    async with async_session_maker() as session:
+        if await _get_checkpoint(session) is None:
+            session.add(JobCheckpoint(name=JOB_NAME))
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+        if not await _claim(session):
+            return await get_status()
+        cp = await _get_checkpoint(session)
+        await session.refresh(cp)
+        now = datetime.now(timezone.utc)
+        if restart or cp.status in ("idle", "done") or cp.target_key_id != target_kid:
+            cp.last_id = 0
+            cp.scanned = cp.updated = cp.skipped = cp.failed = 0
+            cp.started_at = now
+            cp.finished_at = None
+        cp.status = "running"
+        cp.error = None
+        cp.target_key_id = target_kid
+        cp.updated_at = now
+        session.add(cp)
+        await session.commit()
+    _TASK = asyncio.create_task(_run(batch_size, max_rows_per_sec))
+    return await get_status()
+
+
+async def pause() -> Dict[str, object]:
+    """Stop after the current batch; ``start`` resumes from the checkpoint."""
+    async with async_session_maker() as session:
+        cp = await _get_checkpoint(session)
+        if cp is not None and cp.status == "running":
+            # The lease holder, in whichever worker, stops at its next batch
+            cp.status = "paused"
+            cp.owner = None
+            cp.updated_at = datetime.now(timezone.utc)
+            session.add(cp)
+            await session.commit()
+    if _TASK is not None:
+        await asyncio.wait([_TASK], timeout=30)
+    return await get_status()
+
+
+async def resume_if_interrupted(batch_size: int = 200, max_rows_per_sec: float = 500.0) -> None:
+    """Pick up a run that was still marked running when the process stopped.
+
+    Every worker calls this at startup; one wins the lease and the rest keep
+    checking once per lease period in case the winner dies.
+    """
+    try:
+        while not is_running():
+            async with async_session_maker() as session:
+                cp = await _get_checkpoint(session)
+            if cp is None or cp.status != "running":
+                return
+            await start(batch_size=batch_size, max_rows_per_sec=max_rows_per_sec)
+            if not is_running():
+                await asyncio.sleep(JOB_LEASE_SECONDS)
+    except Exception:
+        # Best-effort; the admin endpoint can always resume by hand
+        pass
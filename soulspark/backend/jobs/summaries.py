@@ -0,0 +1,27 @@
+"""Per-entry summaries, computed in the background after journal writes."""
+from __future__ import annotations
+
+from ..database import async_session_maker
+from ..models.journal import JournalEntry
+from ..utils.ai import agenerate_entry_summary
+from ..utils.crypto import decrypt_text, encrypt_text
+
+
+async def summarize_entry(entry_id: int, content_token: str) -> None:
+    """Store a summary of the entry as it was when ``content_token`` was written.
+
+    Runs as a response background task. If the entry has been edited since,
+    the edit queued its own run and this one is dropped.
+    """
+    try:
+        summary = await agenerate_entry_summary(decrypt_text(content_token))
+        async with async_session_maker() as session:
+            entry = await session.get(JournalEntry, entry_id)
+            if entry is None or entry.content != content_token:
+                return
+            entry.summary = encrypt_text(summary) if summary else None
+            session.add(entry)
+            await session.commit()
+    except Exception:
+        # Best-effort; prompts fall back to truncating the full text
+        pass
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
 from datetime import date
 
@@ -9,16 +11,28 @@ from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlmodel import select
+from apscheduler.triggers.interval import IntervalTrigger
 
-from .database import init_db, get_session
-from .models.journal import DailyVerse
+from .auth import user_cache_stats
+from .database import dispose_engines, init_db, pool_stats
 from .routes import verse as verse_routes
 from .routes import mood as mood_routes
 from .routes import journal as journal_routes
 from .routes import auth as auth_routes
 from .routes import qa as qa_routes
-from .utils.ai import generate_ai_reflection
+from .routes import admin as admin_routes
+from .jobs import reencrypt as reencrypt_job
+from .utils.crypto import prewarm_keys
+from .utils.http import close_http_client
+from .utils.http_cache import CompressionMiddleware
+from .utils.ai import (
+    ai_status,
+    answer_cache_stats,
+    encouragement_cache_stats,
+    init_ai,
+    shutdown_ai,
+    warmup_ai,
+)
 
 # Load environment variables from .env if present (local dev convenience).
 # Be robust to where uvicorn is launched from.
@@ -39,6 +53,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "ETag"],
+)
+# gzip/br for JSON bodies over the threshold; already-encoded responses pass through
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024")),
+    compresslevel=int(os.getenv("RESPONSE_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("RESPONSE_BROTLI_QUALITY", "5")),
 )
 
 # Routers
@@ -47,39 +69,59 @@ app.include_router(mood_routes.router)
 app.include_router(journal_routes.router)
 app.include_router(auth_routes.router)
 app.include_router(qa_routes.router)
+app.include_router(admin_routes.router)
+
 
+logger = logging.getLogger(__name__)
 
 scheduler: AsyncIOScheduler | None = None
+# Startup tasks nothing awaits; held here so they aren't collected mid-run
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+
+def _on_task_done(task: asyncio.Task) -> None:
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s failed", task.get_name(), exc_info=task.exception())
+
+
+def _spawn(coro, name: str) -> asyncio.Task:
+    task = asyncio.create_task(coro, name=name)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_on_task_done)
+    return task
+
+
+async def _cancel_background_tasks() -> None:
+    tasks = list(_BACKGROUND_TASKS)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def ensure_today_verse() -> None:
-    today = date.today()
-    # Check exists
-    with get_session() as session:
-        existing = session.exec(select(DailyVerse).where(DailyVerse.date == today)).first()
-        if existing:
-            return
-    # Fetch
-    verse_text, reference = await verse_routes._fetch_bible_verse()
-    ai = generate_ai_reflection(verse_text=verse_text, reference=reference)
-    dv = DailyVerse(
-        date=today,
-        verse_text=verse_text,
-        reference=reference,
-        reflection=ai.get("reflection"),
-        encouragement=ai.get("encouragement"),
-    )
-    with get_session() as session:
-        session.add(dv)
-        session.commit()
+    await verse_routes.get_daily_verse(date.today())
+
+
+async def prefill_verses() -> None:
+    await verse_routes.prefill_verses()
 
 
 @app.on_event("startup")
 async def on_startup():
     global scheduler
     init_db()
-    # seed today's verse immediately
+    # Derive journal keys in the background so no request pays the KDF
+    prewarm_keys()
+    # Build the shared Gemini client once; warm it up without delaying startup
+    init_ai()
+    if os.getenv("GEMINI_WARMUP", "1").lower() in ("1", "true", "yes"):
+        _spawn(warmup_ai(), "warmup_ai")
+    # Carry on with a re-encryption run the last process didn't finish
+    _spawn(reencrypt_job.resume_if_interrupted(), "reencrypt_resume")
+    # seed today's verse immediately, then the days around it in the background
     await ensure_today_verse()
+    _spawn(prefill_verses(), "prefill_verses")
 
     # Start scheduler for daily refresh
     hour = int(os.getenv("VERSE_SCHEDULE_HOUR", "7"))
@@ -88,12 +130,37 @@ async def on_startup():
     trigger = CronTrigger(hour=hour, minute=minute)
 
     scheduler.add_job(ensure_today_verse, trigger, id="ensure_today_verse", replace_existing=True)
+    # Keep VERSE_PREFETCH_DAYS ready; a failed day is retried on the next run
+    interval = int(os.getenv("VERSE_PREFETCH_INTERVAL_MINUTES", "60"))
+    scheduler.add_job(
+        prefill_verses, IntervalTrigger(minutes=interval), id="prefill_verses", replace_existing=True, coalesce=True
+    )
     scheduler.start()
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+    await _cancel_background_tasks()
+    shutdown_ai()
+    await close_http_client()
+    await dispose_engines()
+
+
 @app.get("/health")
 async def health():
-    return {"ok": True}
+    return {
+        "ok": True,
+        "ai": ai_status(),
+        "db": pool_stats(),
+        "bible_api": verse_routes.bible_api_status(),
+        "caches": {
+            "encouragement": encouragement_cache_stats(),
+            "users": user_cache_stats(),
+            "answers": answer_cache_stats(),
+        },
+    }
 
 
 # Uvicorn entrypoint hint: uvicorn soulspark.backend.main:app --reload
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+
+class JobCheckpoint(SQLModel, table=True):
+    """Progress of a resumable maintenance job (one row per job name)."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(index=True, sa_column_kwargs={"unique": True})
+    status: str = Field(default="idle")  # idle | running | paused | done | failed
+    last_id: int = Field(default=0)
+    scanned: int = Field(default=0)
+    updated: int = Field(default=0)
+    # Rows edited by a user while their batch was being re-encrypted
+    skipped: int = Field(default=0)
+    failed: int = Field(default=0)
+    target_key_id: Optional[str] = None
+    # Lease: the worker running the job and when it last made progress
+    owner: Optional[str] = None
+    heartbeat: Optional[datetime] = None
+    error: Optional[str] = None
+    started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 from datetime import datetime, timezone, date as Date
 from typing import Optional
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 
 
 class JournalEntry(SQLModel, table=True):
+    # Serves the per-user, newest-first keyset pagination in GET /journal
+    __table_args__ = (
+        Index("ix_journalentry_user_created_id", "user_id", text("created_at DESC"), "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
     content: str
@@ -13,6 +19,25 @@ class JournalEntry(SQLModel, table=True):
     private: bool = Field(default=False, index=True)
     mood: Optional[str] = Field(default=None)
     title: Optional[str] = Field(default=None)
+    # Encrypted first PREVIEW_CHARS of content and the plaintext length, so the
+    # summary list never has to decrypt full bodies
+    preview: Optional[str] = Field(default=None)
+    content_length: Optional[int] = Field(default=None)
+    # Indexed words in title + content; BM25 length normalisation in search.py
+    term_count: Optional[int] = Field(default=None)
+    # Encrypted short summary of long entries, filled in after each write
+    # (jobs/summaries.py) and used to fit /journal/ask prompts into budget
+    summary: Optional[str] = Field(default=None)
+
+
+class JournalTerm(SQLModel, table=True):
+    """Blind keyword index: one row per (entry, hashed term), see utils/blind_index."""
+
+    # Primary key order serves "user_id = ? AND term IN (...)" lookups
+    user_id: int = Field(primary_key=True)
+    term: str = Field(primary_key=True)
+    entry_id: int = Field(primary_key=True, foreign_key="journalentry.id", index=True)
+    tf: int = Field(default=1)
 
 
 class DailyVerse(SQLModel, table=True):
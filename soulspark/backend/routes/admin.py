@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..auth import require_admin_secret
+from ..jobs import reencrypt
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_secret)])
+
+
+@router.post("/reencrypt")
+async def start_reencrypt(
+    batch_size: int = Query(default=200, ge=1, le=5000),
+    max_rows_per_sec: float = Query(default=500.0, ge=0, description="0 disables throttling"),
+    restart: bool = Query(default=False),
+) -> dict:
+    """Start or resume re-encrypting every journal entry under the active key.
+
+    Covers plaintext, Fernet and older AES-GCM key ids. Runs in the background
+    in short per-batch transactions; poll `GET /admin/reencrypt` for progress.
+    """
+    try:
+        return await reencrypt.start(batch_size=batch_size, max_rows_per_sec=max_rows_per_sec, restart=restart)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/reencrypt")
+async def reencrypt_status() -> dict:
+    return await reencrypt.get_status()
+
+
+@router.post("/reencrypt/pause")
+async def pause_reencrypt() -> dict:
+    return await reencrypt.pause()
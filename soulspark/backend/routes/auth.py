@@ -1,41 +1,42 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 import secrets
 import os
 
-from ..auth import verify_google_id_token, create_access_token
-from ..database import get_session
+from ..auth import create_access_token, invalidate_user_cache, verify_google_id_token
+from ..database import get_async_session
 from ..models.user import User
 from ..schemas.auth import GoogleAuthRequest, AuthResponse, UserOut
 from pydantic import BaseModel
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/google", response_model=AuthResponse)
-async def google_login(payload: GoogleAuthRequest) -> AuthResponse:
-    info = verify_google_id_token(payload.id_token)
+async def google_login(payload: GoogleAuthRequest, session: AsyncSession = Depends(get_async_session)) -> AuthResponse:
+    info = await verify_google_id_token(payload.id_token)
     email = info.get("email")
     name = info.get("name")
     picture = info.get("picture")
 
-    with get_session() as session:
-        user = session.exec(select(User).where(User.email == email)).first()
-        if user is None:
-            user = User(email=email, name=name, picture=picture)
-            session.add(user)
-            session.commit()
-            session.refresh(user)
-        else:
-            user.name = name or user.name
-            user.picture = picture or user.picture
-            session.add(user)
-            session.commit()
+    user = (await session.exec(select(User).where(User.email == email))).first()
+    if user is None:
+        user = User(email=email, name=name, picture=picture)
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+    else:
+        user.name = name or user.name
+        user.picture = picture or user.picture
+        session.add(user)
+        await session.commit()
 
-        token = create_access_token(sub=str(user.id), data={"uid": user.id, "email": user.email})
-        return AuthResponse(access_token=token, user=UserOut(id=user.id, email=user.email, name=user.name, picture=user.picture))
+    invalidate_user_cache(user.id)
+    token = create_access_token(sub=str(user.id), data={"uid": user.id, "email": user.email})
+    return AuthResponse(access_token=token, user=UserOut(id=user.id, email=user.email, name=user.name, picture=user.picture))
 
 
 class IssueRequest(BaseModel):
@@ -45,7 +46,11 @@ class IssueRequest(BaseModel):
 
 
 @router.post("/issue", response_model=AuthResponse)
-async def issue_token(req: IssueRequest, request: Request) -> AuthResponse:
+async def issue_token(
+    req: IssueRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+) -> AuthResponse:
     """Issue a JWT for a user via server-side secret.
 
     Security: requires header `X-Admin-Secret` matching env `TOKEN_ISSUER_SECRET`.
@@ -57,21 +62,21 @@ async def issue_token(req: IssueRequest, request: Request) -> AuthResponse:
         raise HTTPException(status_code=403, detail="Forbidden")
 
     email = req.email.strip().lower()
-    with get_session() as session:
-        user = session.exec(select(User).where(User.email == email)).first()
-        if user is None:
-            user = User(email=email, name=req.name, picture=req.picture)
-            session.add(user)
-            session.commit()
-            session.refresh(user)
-        else:
-            user.name = req.name or user.name
-            user.picture = req.picture or user.picture
-            session.add(user)
-            session.commit()
-
-        token = create_access_token(sub=str(user.id), data={"uid": user.id, "email": user.email})
-        return AuthResponse(access_token=token, user=UserOut(id=user.id, email=user.email, name=user.name, picture=user.picture))
+    user = (await session.exec(select(User).where(User.email == email))).first()
+    if user is None:
+        user = User(email=email, name=req.name, picture=req.picture)
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+    else:
+        user.name = req.name or user.name
+        user.picture = req.picture or user.picture
+        session.add(user)
+        await session.commit()
+
+    invalidate_user_cache(user.id)
+    token = create_access_token(sub=str(user.id), data={"uid": user.id, "email": user.email})
+    return AuthResponse(access_token=token, user=UserOut(id=user.id, email=user.email, name=user.name, picture=user.picture))
 
 
 # Simple secret generator — returns a random long string
@@ -1,128 +1,663 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+import asyncio
+import base64
+import json
+import os
+import re
+import zipfile
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, BackgroundTasks, Body, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import defer
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
-from ..models.journal import JournalEntry
-from ..schemas.schemas import JournalCreate, JournalRead, JournalUpdate
-from ..utils.crypto import encrypt_text, decrypt_text, has_encryption, is_probably_encrypted
-from ..auth import get_current_user
-from ..models.user import User
+from ..database import async_session_maker, get_async_session
+from ..models.journal import JournalEntry, JournalTerm
+from ..schemas.schemas import (
+    JournalBatchItemResult,
+    JournalBatchResult,
+    JournalCreate,
+    JournalImportItem,
+    JournalRead,
+    JournalSummary,
+    JournalUpdate,
+)
+from ..utils.crypto import (
+    adecrypt_many,
+    aencrypt_many,
+    decrypt_text,
+    encrypt_text,
+    has_encryption,
+    is_probably_encrypted,
+)
+from ..auth import UserClaims, get_current_user_claims
+from ..jobs.summaries import summarize_entry
+from ..search import ensure_indexed, index_entry, rank_entries, unindex_entry
+from ..utils.ai import ENTRY_SUMMARY_MIN_CHARS, invalidate_answer_cache
+from ..utils.blind_index import term_hashes
+from ..utils.http_cache import etag_matches, not_modified, weak_etag
 
 router = APIRouter(prefix="/journal", tags=["journal"])
 
+MAX_PAGE_SIZE = 200
+PREVIEW_CHARS = 160
+BATCH_MAX_ITEMS = 1000
+# Entries per transaction for /batch and /import
+IMPORT_CHUNK_SIZE = int(os.getenv("JOURNAL_IMPORT_CHUNK_SIZE", "500"))
+IMPORT_MAX_ITEMS = int(os.getenv("JOURNAL_IMPORT_MAX_ITEMS", "100000"))
+# Longer /import lines are rejected unread so a body without newlines can't grow the buffer
+IMPORT_MAX_LINE_BYTES = int(os.getenv("JOURNAL_IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+# Rows fetched and decrypted per round trip while exporting
+EXPORT_BATCH_SIZE = int(os.getenv("JOURNAL_EXPORT_BATCH_SIZE", "200"))
+# Columns holding journal text, all encrypted at rest
+_SEALED_FIELDS = ("content", "preview", "summary")
+# Per-user data: browsers may keep it but must revalidate (a cheap 304) each time
+_CACHE_CONTROL = "private, no-cache"
 
-@router.get("", response_model=List[JournalRead])
-async def list_entries(include_private: bool = True, user: User = Depends(get_current_user)) -> List[JournalRead]:
-    with get_session() as session:
-        stmt = select(JournalEntry).where(JournalEntry.user_id == user.id)
-        if not include_private:
-            stmt = stmt.where(JournalEntry.private == False)  # noqa: E712
-        rows = session.exec(stmt.order_by(JournalEntry.created_at.desc())).all()
-        out: List[JournalRead] = []
-        for r in rows:
-            out.append(
-                JournalRead(
-                    id=r.id,
-                    content=decrypt_text(r.content),
-                    created_at=r.created_at,
-                    private=r.private,
-                    mood=r.mood,
-                    title=r.title,
-                )
+
+def _set_preview(entry: JournalEntry, content_plain: str) -> None:
+    """Store the encrypted snippet and length used by the summary view."""
+    entry.preview = encrypt_text(content_plain[:PREVIEW_CHARS])
+    entry.content_length = len(content_plain)
+
+
+def _entry_version(entry: JournalEntry, view: str = "full") -> Tuple[Any, ...]:
+    """Everything a rendered entry depends on, without decrypting it.
+
+    The stored ciphertext stands in for the content: a new nonce on every
+    write means any edit changes it.
+    """
+    body = (entry.preview, entry.content_length) if view == "summary" else entry.content
+    return (entry.id, entry.created_at, entry.private, entry.mood, entry.title, body)
+
+
+def _encode_cursor(entry: JournalEntry) -> str:
+    raw = f"{entry.created_at.isoformat()}|{entry.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, entry_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(entry_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+@router.get("", response_model=List[Union[JournalRead, JournalSummary]])
+async def list_entries(
+    response: Response,
+    include_private: bool = True,
+    view: Literal["full", "summary"] = "full",
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[List[Union[JournalRead, JournalSummary]], Response]:
+    """List entries newest first.
+
+    Without ``limit`` the whole history is returned (legacy clients). With
+    ``limit``, results are keyset-paginated on (created_at, id): pass the
+    ``X-Next-Cursor`` response header back as ``before`` for older entries,
+    or ``X-Prev-Cursor`` as ``after`` for newer ones.
+
+    ``view=summary`` returns metadata plus a short preview and the content
+    length without loading or decrypting full bodies; fetch those on demand
+    via ``GET /journal/{id}``.
+
+    Responses carry an ETag over the page's rows; a matching
+    ``If-None-Match`` gets 304 before anything is decrypted.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    stmt = select(JournalEntry).where(JournalEntry.user_id == user.id)
+    if not include_private:
+        stmt = stmt.where(JournalEntry.private == False)  # noqa: E712
+    key = tuple_(JournalEntry.created_at, JournalEntry.id)
+    if before:
+        stmt = stmt.where(key < tuple_(*_decode_cursor(before)))
+    if after:
+        stmt = stmt.where(key > tuple_(*_decode_cursor(after)))
+    if after:
+        # Walk upwards from the cursor, then flip back to newest-first
+        stmt = stmt.order_by(JournalEntry.created_at.asc(), JournalEntry.id.asc())
+    else:
+        stmt = stmt.order_by(JournalEntry.created_at.desc(), JournalEntry.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    if view == "summary":
+        stmt = stmt.options(defer(JournalEntry.content))
+    rows = list((await session.exec(stmt)).all())
+    has_more = limit is not None and len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+    if after:
+        rows.reverse()
+
+    if limit is not None and rows:
+        # The cursor row itself proves entries exist on the side we came from
+        older_exist = bool(after) or has_more
+        newer_exist = bool(before) or (bool(after) and has_more)
+        if older_exist:
+            response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1])
+        if newer_exist:
+            response.headers["X-Prev-Cursor"] = _encode_cursor(rows[0])
+
+    etag = weak_etag(view, user.id, has_more, *(_entry_version(r, view) for r in rows))
+    if etag_matches(if_none_match, etag):
+        cursors = {k: v for k, v in response.headers.items() if k.lower() in ("x-next-cursor", "x-prev-cursor")}
+        return not_modified(etag, _CACHE_CONTROL, cursors)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+
+    if view == "summary":
+        return await _summaries(rows, session)
+
+    contents = await adecrypt_many([r.content for r in rows])
+    out: List[JournalRead] = []
+    for r, content in zip(rows, contents):
+        out.append(
+            JournalRead(
+                id=r.id,
+                content=content,
+                created_at=r.created_at,
+                private=r.private,
+                mood=r.mood,
+                title=r.title,
             )
-        return out
+        )
+    return out
 
 
-@router.post("", response_model=JournalRead)
-async def create_entry(payload: JournalCreate, user: User = Depends(get_current_user)) -> JournalRead:
-    with get_session() as session:
-        data = payload.model_dump()
-        content_plain = data.pop("content", "")
-        entry = JournalEntry(**data, user_id=user.id, content=encrypt_text(content_plain))
-        session.add(entry)
-        session.commit()
-        session.refresh(entry)
-        return JournalRead(
-            id=entry.id,
-            content=content_plain,
-            created_at=entry.created_at,
-            private=entry.private,
-            mood=entry.mood,
-            title=entry.title,
+async def _summaries(rows: List[JournalEntry], session: AsyncSession) -> List[JournalSummary]:
+    previews = await adecrypt_many([r.preview or "" for r in rows])
+    # Entries written before previews existed: derive from the full body
+    legacy_ids = [r.id for r in rows if r.preview is None]
+    if legacy_ids:
+        res = await session.exec(select(JournalEntry.id, JournalEntry.content).where(JournalEntry.id.in_(legacy_ids)))
+        legacy = dict(res.all())
+        bodies = dict(zip(legacy.keys(), await adecrypt_many(list(legacy.values()))))
+    else:
+        bodies = {}
+    out: List[JournalSummary] = []
+    for r, preview in zip(rows, previews):
+        length = r.content_length
+        if r.id in bodies:
+            preview = bodies[r.id][:PREVIEW_CHARS]
+            length = len(bodies[r.id])
+        out.append(
+            JournalSummary(
+                id=r.id,
+                created_at=r.created_at,
+                private=r.private,
+                mood=r.mood,
+                title=r.title,
+                preview=preview,
+                content_length=length or 0,
+            )
         )
+    return out
+
+
+@router.post("", response_model=JournalRead)
+async def create_entry(
+    payload: JournalCreate,
+    background_tasks: BackgroundTasks,
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> JournalRead:
+    data = payload.model_dump()
+    content_plain = data.pop("content", "")
+    entry = JournalEntry(**data, user_id=user.id, content=encrypt_text(content_plain))
+    _set_preview(entry, content_plain)
+    session.add(entry)
+    await session.flush()
+    await index_entry(session, entry, content_plain)
+    await session.commit()
+    await session.refresh(entry)
+    if len(content_plain) >= ENTRY_SUMMARY_MIN_CHARS:
+        background_tasks.add_task(summarize_entry, entry.id, entry.content)
+    return JournalRead(
+        id=entry.id,
+        content=content_plain,
+        created_at=entry.created_at,
+        private=entry.private,
+        mood=entry.mood,
+        title=entry.title,
+    )
+
+
+@router.get("/search", response_model=List[JournalRead])
+async def search_entries(
+    q: str = Query(min_length=1, max_length=500),
+    include_private: bool = True,
+    limit: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> List[JournalRead]:
+    """Keyword search over title and content, best matches first.
+
+    Matches whole words via the blind index, so only the returned entries are
+    decrypted. Entries that match more of the query words rank first.
+    Entries that predate the index are indexed on the user's first search.
+    """
+    await ensure_indexed(session, user.id)
+    ids = await rank_entries(session, user.id, q, include_private=include_private, limit=limit)
+    if not ids:
+        return []
+    rows = {r.id: r for r in (await session.exec(select(JournalEntry).where(JournalEntry.id.in_(ids)))).all()}
+    hits = [rows[i] for i in ids if i in rows]
+    contents = await adecrypt_many([r.content for r in hits])
+    return [
+        JournalRead(id=r.id, content=c, created_at=r.created_at, private=r.private, mood=r.mood, title=r.title)
+        for r, c in zip(hits, contents)
+    ]
+
+
+async def _export_rows(user_id: int, include_private: bool) -> AsyncIterator[Tuple[JournalEntry, str]]:
+    """(entry, plaintext) oldest first, read through a server-side cursor.
+
+    Opens its own session: the response body is produced after the request's
+    dependencies have been torn down. Only one batch is in memory at a time.
+    """
+    stmt = select(JournalEntry).where(JournalEntry.user_id == user_id)
+    if not include_private:
+        stmt = stmt.where(JournalEntry.private == False)  # noqa: E712
+    stmt = stmt.order_by(JournalEntry.created_at, JournalEntry.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    async with async_session_maker() as session:
+        result = await session.stream_scalars(stmt)
+        async for batch in result.partitions():
+            for entry, plain in zip(batch, await adecrypt_many([r.content for r in batch])):
+                yield entry, plain
+            # Entries already sent are not needed again
+            session.expunge_all()
+
+
+async def _export_ndjson(user_id: int, include_private: bool) -> AsyncIterator[bytes]:
+    async for r, content in _export_rows(user_id, include_private):
+        item = JournalRead(id=r.id, content=content, created_at=r.created_at, private=r.private, mood=r.mood, title=r.title)
+        yield item.model_dump_json().encode("utf-8") + b"\n"
+
+
+class _ZipSink:
+    """Write-only file object for ZipFile; the generator drains it per entry."""
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self.parts)
+        self.parts.clear()
+        return out
+
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+# Range of the ZIP format's DOS timestamps; imported entries may predate it
+_ZIP_MIN_DATE = (1980, 1, 1, 0, 0, 0)
+_ZIP_MAX_DATE = (2107, 12, 31, 23, 59, 58)
+
+
+def _markdown(entry: JournalEntry, content: str) -> str:
+    meta = f"{entry.created_at:%Y-%m-%d %H:%M}" + (f" · {entry.mood}" if entry.mood else "")
+    meta += " · private" if entry.private else ""
+    return f"# {entry.title or 'Untitled'}\n\n_{meta}_\n\n{content}\n"
+
+
+async def _export_zip(user_id: int, include_private: bool) -> AsyncIterator[bytes]:
+    sink = _ZipSink()
+    # ZipFile falls back to data descriptors on a non-seekable sink, so each
+    # file can be sent as soon as it is written
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        async for r, content in _export_rows(user_id, include_private):
+            slug = _SLUG_RE.sub("-", (r.title or "").lower()).strip("-")[:40]
+            name = f"{r.created_at:%Y-%m-%d}-{r.id}{'-' + slug if slug else ''}.md"
+            date_time = min(max(r.created_at.timetuple()[:6], _ZIP_MIN_DATE), _ZIP_MAX_DATE)
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, _markdown(r, content))
+            yield sink.drain()
+    yield sink.drain()
+
+
+@router.get("/export")
+async def export_entries(
+    format: Literal["ndjson", "zip"] = "ndjson",
+    include_private: bool = True,
+    user: UserClaims = Depends(get_current_user_claims),
+) -> StreamingResponse:
+    """Download every entry, oldest first, as NDJSON (`JournalRead` per line)
+    or a ZIP of Markdown files. Streams with flat memory use."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+    if format == "zip":
+        body, media_type, ext = _export_zip(user.id, include_private), "application/zip", "zip"
+    else:
+        body, media_type, ext = _export_ndjson(user.id, include_private), "application/x-ndjson", "ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="journal-{stamp}.{ext}"'},
+    )
 
 
 @router.get("/{entry_id}", response_model=JournalRead)
-async def get_entry(entry_id: int, user: User = Depends(get_current_user)) -> JournalRead:
-    with get_session() as session:
-        entry = session.get(JournalEntry, entry_id)
-        if not entry or entry.user_id != user.id:
-            raise HTTPException(status_code=404, detail="Not found")
-        return JournalRead(
-            id=entry.id,
-            content=decrypt_text(entry.content),
-            created_at=entry.created_at,
-            private=entry.private,
-            mood=entry.mood,
-            title=entry.title,
-        )
+async def get_entry(
+    entry_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> Union[JournalRead, Response]:
+    entry = await session.get(JournalEntry, entry_id)
+    if not entry or entry.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Not found")
+    etag = weak_etag(*_entry_version(entry))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, _CACHE_CONTROL)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+    return JournalRead(
+        id=entry.id,
+        content=decrypt_text(entry.content),
+        created_at=entry.created_at,
+        private=entry.private,
+        mood=entry.mood,
+        title=entry.title,
+    )
 
 
 @router.put("/{entry_id}", response_model=JournalRead)
-async def update_entry(entry_id: int, payload: JournalUpdate, user: User = Depends(get_current_user)) -> JournalRead:
-    with get_session() as session:
-        entry = session.get(JournalEntry, entry_id)
-        if not entry or entry.user_id != user.id:
-            raise HTTPException(status_code=404, detail="Not found")
-        data = payload.model_dump(exclude_unset=True)
-        for k, v in data.items():
-            if k == "content" and isinstance(v, str):
-                setattr(entry, k, encrypt_text(v))
-            else:
-                setattr(entry, k, v)
-        session.add(entry)
-        session.commit()
-        session.refresh(entry)
-        return JournalRead(
-            id=entry.id,
-            content=decrypt_text(entry.content),
-            created_at=entry.created_at,
-            private=entry.private,
-            mood=entry.mood,
-            title=entry.title,
-        )
+async def update_entry(
+    entry_id: int,
+    payload: JournalUpdate,
+    background_tasks: BackgroundTasks,
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> JournalRead:
+    entry = await session.get(JournalEntry, entry_id)
+    if not entry or entry.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Not found")
+    data = payload.model_dump(exclude_unset=True)
+    content_plain: Optional[str] = None
+    for k, v in data.items():
+        if k == "content" and isinstance(v, str):
+            setattr(entry, k, encrypt_text(v))
+            _set_preview(entry, v)
+            entry.summary = None
+            content_plain = v
+        else:
+            setattr(entry, k, v)
+    session.add(entry)
+    if content_plain is not None or "title" in data:
+        if content_plain is None:
+            content_plain = decrypt_text(entry.content)
+        await index_entry(session, entry, content_plain)
+    await session.commit()
+    await session.refresh(entry)
+    if isinstance(data.get("content"), str):
+        # New context already misses the cache; this drops answers quoting the old text
+        invalidate_answer_cache(str(user.id))
+        if len(data["content"]) >= ENTRY_SUMMARY_MIN_CHARS:
+            background_tasks.add_task(summarize_entry, entry.id, entry.content)
+    return JournalRead(
+        id=entry.id,
+        content=decrypt_text(entry.content),
+        created_at=entry.created_at,
+        private=entry.private,
+        mood=entry.mood,
+        title=entry.title,
+    )
 
 
 @router.delete("/{entry_id}")
-async def delete_entry(entry_id: int, user: User = Depends(get_current_user)) -> dict:
-    with get_session() as session:
-        entry = session.get(JournalEntry, entry_id)
-        if not entry or entry.user_id != user.id:
-            raise HTTPException(status_code=404, detail="Not found")
-        session.delete(entry)
-        session.commit()
-        return {"ok": True}
+async def delete_entry(
+    entry_id: int,
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> dict:
+    entry = await session.get(JournalEntry, entry_id)
+    if not entry or entry.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Not found")
+    await unindex_entry(session, entry.id)
+    await session.delete(entry)
+    await session.commit()
+    # Cached answers may quote the deleted entry
+    invalidate_answer_cache(str(user.id))
+    return {"ok": True}
 
 
 @router.post("/migrate_encrypt")
-async def migrate_encrypt(user: User = Depends(get_current_user)) -> dict:
+async def migrate_encrypt(
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> dict:
     """Encrypt legacy plaintext entries for the current user.
 
-    Only runs if encryption is configured. Skips entries that already look encrypted.
+    Only runs if encryption is configured. Seals ``content``, ``preview`` and
+    ``summary``, skipping any value that already carries a token prefix.
     """
     if not has_encryption():
         return {"updated": 0, "note": "encryption key not configured"}
-    updated = 0
-    with get_session() as session:
-        rows = session.exec(select(JournalEntry).where(JournalEntry.user_id == user.id)).all()
-        for r in rows:
-            if not is_probably_encrypted(r.content or ""):
-                r.content = encrypt_text(decrypt_text(r.content or ""))
-                session.add(r)
-                updated += 1
-        if updated:
-            session.commit()
-    return {"updated": updated}
+    rows = (await session.exec(select(JournalEntry).where(JournalEntry.user_id == user.id))).all()
+    legacy = [(r, f) for r in rows for f in _SEALED_FIELDS if (v := getattr(r, f)) and not is_probably_encrypted(v)]
+    for (r, f), token in zip(legacy, await aencrypt_many([getattr(r, f) for r, f in legacy])):
+        setattr(r, f, token)
+        session.add(r)
+    if legacy:
+        await session.commit()
+    return {"updated": len({r.id for r, _ in legacy})}
+
+
+@router.post("/reindex")
+async def reindex(
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> dict:
+    """Rebuild the current user's search index (entries written before search
+    existed, or after changing JOURNAL_INDEX_KEY). Commits every batch."""
+    last_id, indexed = 0, 0
+    while True:
+        rows = list(
+            (
+                await session.exec(
+                    select(JournalEntry)
+                    .where(JournalEntry.user_id == user.id, JournalEntry.id > last_id)
+                    .order_by(JournalEntry.id)
+                    .limit(200)
+                )
+            ).all()
+        )
+        if not rows:
+            return {"indexed": indexed}
+        for r, plain in zip(rows, await adecrypt_many([r.content for r in rows])):
+            await index_entry(session, r, plain)
+        await session.commit()
+        last_id = rows[-1].id
+        indexed += len(rows)
+
+
+def _validate_item(index: int, raw: Any, results: List[JournalBatchItemResult]) -> Optional[JournalImportItem]:
+    try:
+        return JournalImportItem.model_validate(raw)
+    except ValidationError as e:
+        err = e.errors()[0]
+        loc = ".".join(str(x) for x in err.get("loc", ())) or "item"
+        results.append(JournalBatchItemResult(index=index, error=f"{loc}: {err.get('msg')}"))
+        return None
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Aware UTC, as ``JournalEntry.created_at`` defaults to; naive input is taken as UTC."""
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _term_counts(user_id: int, items: List[JournalImportItem]) -> List[Dict[str, int]]:
+    return [term_hashes(user_id, f"{it.title or ''}\n{it.content}") for it in items]
+
+
+async def _insert_chunk(
+    session: AsyncSession,
+    user_id: int,
+    chunk: List[Tuple[int, JournalImportItem]],
+) -> List[JournalBatchItemResult]:
+    """Encrypt, index and insert one chunk of entries in a single transaction.
+
+    Entries and index rows each go in as one executemany INSERT. Unlike
+    single writes, bulk imports queue no summaries (one model call per long
+    entry); /journal/ask truncates unsummarized entries instead, and the
+    next edit of an entry summarizes it.
+    """
+    items = [it for _, it in chunk]
+    plains = [it.content for it in items]
+    sealed = await aencrypt_many(plains + [p[:PREVIEW_CHARS] for p in plains])
+    contents, previews = sealed[: len(items)], sealed[len(items) :]
+    terms = await asyncio.to_thread(_term_counts, user_id, items)
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "content": content,
+            "preview": preview,
+            "content_length": len(it.content),
+            "term_count": sum(t.values()),
+            "created_at": _as_utc(it.created_at) if it.created_at else now,
+            "private": it.private,
+            "mood": it.mood,
+            "title": it.title,
+        }
+        for it, content, preview, t in zip(items, contents, previews, terms)
+    ]
+    stmt = insert(JournalEntry).returning(JournalEntry.id, sort_by_parameter_order=True)
+    ids = list((await session.exec(stmt, params=rows)).scalars().all())
+    term_rows = [
+        {"user_id": user_id, "term": term, "entry_id": entry_id, "tf": tf}
+        for entry_id, t in zip(ids, terms)
+        for term, tf in t.items()
+    ]
+    if term_rows:
+        await session.exec(insert(JournalTerm), params=term_rows)
+    await session.commit()
+    return [JournalBatchItemResult(index=index, id=entry_id) for (index, _), entry_id in zip(chunk, ids)]
+
+
+async def _insert_or_report(
+    session: AsyncSession,
+    user_id: int,
+    chunk: List[Tuple[int, JournalImportItem]],
+    results: List[JournalBatchItemResult],
+) -> None:
+    try:
+        results.extend(await _insert_chunk(session, user_id, chunk))
+    except Exception as e:
+        await session.rollback()
+        results.extend(JournalBatchItemResult(index=index, error=f"insert failed: {type(e).__name__}") for index, _ in chunk)
+
+
+def _batch_result(results: List[JournalBatchItemResult], truncated: bool = False) -> JournalBatchResult:
+    results.sort(key=lambda r: r.index)
+    created = sum(1 for r in results if r.id is not None)
+    return JournalBatchResult(created=created, failed=len(results) - created, results=results, truncated=truncated)
+
+
+@router.post("/batch", response_model=JournalBatchResult)
+async def create_entries_batch(
+    payload: List[Any] = Body(...),
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> JournalBatchResult:
+    """Create up to BATCH_MAX_ITEMS entries in one request.
+
+    Items take the `POST /journal` fields plus an optional `created_at`. Each
+    is validated on its own, so one bad item is reported in `results` (by its
+    position) without rejecting the rest.
+    """
+    if len(payload) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_ITEMS} entries per batch")
+    results: List[JournalBatchItemResult] = []
+    valid = [(i, it) for i, raw in enumerate(payload) if (it := _validate_item(i, raw, results)) is not None]
+    for start in range(0, len(valid), IMPORT_CHUNK_SIZE):
+        await _insert_or_report(session, user.id, valid[start : start + IMPORT_CHUNK_SIZE], results)
+    return _batch_result(results)
+
+
+@router.post("/import", response_model=JournalBatchResult)
+async def import_entries(
+    request: Request,
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> JournalBatchResult:
+    """Import a JSONL body (one `/batch` item per line) as it streams in.
+
+    Entries are committed every JOURNAL_IMPORT_CHUNK_SIZE lines, so a failed
+    chunk doesn't undo earlier ones. `results[].index` is the 1-based line
+    number; blank lines are skipped and lines over JOURNAL_IMPORT_MAX_LINE_BYTES
+    are reported without being buffered. After JOURNAL_IMPORT_MAX_ITEMS entries
+    the rest of the body is ignored and the result has `truncated: true`.
+    """
+    results: List[JournalBatchItemResult] = []
+    pending: List[Tuple[int, JournalImportItem]] = []
+    buffer = b""
+    overflow = False  # inside a line that is already too long
+    line_no = 0
+    seen = 0
+    truncated = False
+
+    async def handle(line: bytes, too_long: bool = False) -> None:
+        nonlocal line_no, seen, truncated
+        line_no += 1
+        if too_long or len(line) > IMPORT_MAX_LINE_BYTES:
+            results.append(
+                JournalBatchItemResult(index=line_no, error=f"line longer than {IMPORT_MAX_LINE_BYTES} bytes")
+            )
+            return
+        if not line.strip():
+            return
+        seen += 1
+        if seen > IMPORT_MAX_ITEMS:
+            truncated = True
+            return
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            results.append(JournalBatchItemResult(index=line_no, error=f"invalid JSON: {e}"))
+            return
+        item = _validate_item(line_no, raw, results)
+        if item is not None:
+            pending.append((line_no, item))
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            await _insert_or_report(session, user.id, pending[:], results)
+            pending.clear()
+
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            await handle(line, too_long=overflow)
+            overflow = False
+            if truncated:
+                break
+        if truncated:
+            break
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            # Drop the rest of this line as it arrives
+            overflow, buffer = True, b""
+    if (buffer or overflow) and not truncated:
+        await handle(buffer, too_long=overflow)
+    if pending:
+        await _insert_or_report(session, user.id, pending, results)
+    return _batch_result(results, truncated)
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import json
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..auth import get_current_user
-from ..database import get_session
+from ..auth import UserClaims, get_current_user_claims
+from ..database import get_async_session
 from ..models.journal import JournalEntry
-from ..models.user import User
-from ..utils.ai import generate_journal_answer, generate_entry_answer
-from ..utils.crypto import decrypt_text
+from ..search import ASK_RETRIEVAL_ENTRIES, ASK_TOP_CHUNKS, best_chunks, ensure_indexed, rank_entries
+from ..utils.ai import (
+    agenerate_entry_answer,
+    agenerate_journal_answer,
+    astream_entry_answer,
+    astream_journal_answer,
+)
+from ..utils.context import ContextItem, build_context
+from ..utils.crypto import adecrypt_many, decrypt_text
 
 
 class AskRequest(BaseModel):
@@ -24,25 +35,104 @@ class AskResponse(BaseModel):
 router = APIRouter(prefix="/journal/ask", tags=["journal"])
 
 
-@router.post("", response_model=AskResponse)
-async def ask(payload: AskRequest, user: User = Depends(get_current_user)) -> AskResponse:
+async def _load_context(payload: AskRequest, user: UserClaims, session: AsyncSession) -> tuple[str, str]:
+    """Validate the question and return it with the decrypted journal context."""
     q = payload.question.strip()
     if not q:
         raise HTTPException(status_code=400, detail="Question required")
-    with get_session() as session:
-        if payload.entry_id:
-            entry = session.get(JournalEntry, payload.entry_id)
-            if not entry or entry.user_id != user.id:
-                raise HTTPException(status_code=404, detail="Entry not found")
-            text = decrypt_text(entry.content or "")
-        else:
-            # Concatenate last 20 entries for context
-            rows = session.exec(
-                select(JournalEntry).where(JournalEntry.user_id == user.id).order_by(JournalEntry.created_at.desc()).limit(20)
-            ).all()
-            text = "\n---\n".join([decrypt_text(r.content) for r in rows if r and r.content])
     if payload.entry_id:
-        answer = generate_entry_answer(q, text)
+        entry = await session.get(JournalEntry, payload.entry_id)
+        if not entry or entry.user_id != user.id:
+            raise HTTPException(status_code=404, detail="Entry not found")
+        summary = decrypt_text(entry.summary) if entry.summary else None
+        text = build_context([ContextItem(header="", text=decrypt_text(entry.content or ""), summary=summary)])
+    else:
+        text = await _retrieve_context(q, user.id, session)
+    return q, text
+
+
+async def _retrieve_context(question: str, user_id: int, session: AsyncSession) -> str:
+    """The passages of the user's journal most relevant to ``question``.
+
+    Ranks entries through the search index, then keeps the best-matching
+    chunks of those. Questions with no indexed words ("how have I been?")
+    fall back to the most recent entries. The result fits ASK_CONTEXT_TOKENS,
+    using stored entry summaries where full passages don't fit. Entries that
+    predate the index are indexed first, so older history is ranked too.
+    """
+    await ensure_indexed(session, user_id)
+    ids = await rank_entries(session, user_id, question, limit=ASK_RETRIEVAL_ENTRIES)
+    if ids:
+        stmt = select(JournalEntry).where(JournalEntry.id.in_(ids))
+    else:
+        stmt = (
+            select(JournalEntry)
+            .where(JournalEntry.user_id == user_id)
+            .order_by(JournalEntry.created_at.desc())
+            .limit(ASK_RETRIEVAL_ENTRIES)
+        )
+    rows = [r for r in (await session.exec(stmt)).all() if r.content]
+    if ids:
+        rank = {entry_id: n for n, entry_id in enumerate(ids)}
+        rows.sort(key=lambda r: rank[r.id])
+    contents = await adecrypt_many([r.content for r in rows])
+    summaries = await adecrypt_many([r.summary or "" for r in rows])
+    passages: dict = {}
+    for entry_id, chunk in best_chunks(question, [(r.id, c) for r, c in zip(rows, contents)], k=ASK_TOP_CHUNKS):
+        passages.setdefault(entry_id, []).append(chunk)
+    items = []
+    for r, summary in zip(rows, summaries):
+        text = " … ".join(passages.get(r.id, [])) or summary
+        if text:
+            header = f"[{r.created_at:%Y-%m-%d}{' ' + r.title if r.title else ''}]"
+            items.append(ContextItem(header=header, text=text, summary=summary or None))
+    return build_context(items)
+
+
+@router.post("", response_model=AskResponse)
+async def ask(
+    payload: AskRequest,
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> AskResponse:
+    q, text = await _load_context(payload, user, session)
+    if payload.entry_id:
+        answer = await agenerate_entry_answer(q, text, cache_scope=str(user.id))
     else:
-        answer = generate_journal_answer(q, text)
+        answer = await agenerate_journal_answer(q, text, cache_scope=str(user.id))
     return AskResponse(answer=answer)
+
+
+@router.post("/stream")
+async def ask_stream(
+    payload: AskRequest,
+    user: UserClaims = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_async_session),
+) -> StreamingResponse:
+    """Server-sent events variant of ``POST /journal/ask``.
+
+    Emits ``delta`` events with sanitized text as Gemini produces it, a
+    ``replace`` event with the full text so far whenever sanitizing a later
+    chunk rewrote text already sent, then a single ``done`` event whose
+    ``answer`` matches the non-streaming response.
+    """
+    q, text = await _load_context(payload, user, session)
+    if payload.entry_id:
+        events = astream_entry_answer(q, text, cache_scope=str(user.id))
+    else:
+        events = astream_journal_answer(q, text, cache_scope=str(user.id))
+
+    async def sse() -> AsyncIterator[str]:
+        async for event in events:
+            if "delta" in event:
+                yield f"event: delta\ndata: {json.dumps({'text': event['delta']})}\n\n"
+            elif "replace" in event:
+                yield f"event: replace\ndata: {json.dumps({'text': event['replace']})}\n\n"
+            else:
+                yield f"event: done\ndata: {json.dumps({'answer': event['answer']})}\n\n"
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
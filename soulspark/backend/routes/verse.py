@@ -1,20 +1,48 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Optional
+import asyncio
+import logging
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 
-from ..database import get_session
+from ..database import async_session_maker
 from ..models.journal import DailyVerse
 from ..schemas.schemas import DailyVerseResponse
-from ..utils.ai import generate_ai_reflection
+from ..utils.ai import agenerate_ai_reflection
+from ..utils.cache import TTLCache
+from ..utils.http import CircuitBreaker, UpstreamError, get_text
+from ..utils.http_cache import Precompressed
 
 router = APIRouter(prefix="/verse", tags=["verse"])
 
-BIBLE_API_URL = "https://beta.ourmanna.com/api/v1/get/?format=text"
+logger = logging.getLogger(__name__)
+
+# Point BIBLE_API_URL at a local stand-in (bench/bible_standin.py) to test outages
+BIBLE_API_URL = os.getenv("BIBLE_API_URL", "https://beta.ourmanna.com/api/v1/get/?format=text")
+# OurManna only serves the current verse of the day, so prefetched days get a random verse
+BIBLE_API_PREFETCH_URL = os.getenv(
+    "BIBLE_API_PREFETCH_URL", str(httpx.URL(BIBLE_API_URL).copy_merge_params({"order": "random"}))
+)
+# Days after today kept ready (with reflections) by the prefetch job
+VERSE_PREFETCH_DAYS = int(os.getenv("VERSE_PREFETCH_DAYS", "3"))
+_BIBLE_BREAKER = CircuitBreaker(
+    "bible-api",
+    failure_threshold=int(os.getenv("BIBLE_API_FAILURE_THRESHOLD", "3")),
+    reset_timeout=float(os.getenv("BIBLE_API_RESET_SECONDS", "60")),
+)
+# How long /verse/today waits on a fresh build before serving the last stored verse
+VERSE_STALE_AFTER_SECONDS = float(os.getenv("VERSE_STALE_AFTER_SECONDS", "3"))
+_STALE_TTL_SECONDS = 60.0
+# Optional directory for the rendered {date}.json(.gz/.br) files, e.g. for a CDN or nginx
+VERSE_ARTIFACT_DIR = os.getenv("VERSE_ARTIFACT_DIR")
 
 
 def _parse_reference(verse_text: str) -> Optional[str]:
@@ -45,53 +73,249 @@ def _strip_reference_from_text(text: str, reference: Optional[str]) -> str:
     return text.strip()
 
 
-async def _fetch_bible_verse() -> tuple[str, Optional[str]]:
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.get(BIBLE_API_URL)
-        if resp.status_code != 200:
-            raise HTTPException(status_code=502, detail="Bible API unavailable")
-        text = resp.text.strip()
-        reference = _parse_reference(text)
-        clean_text = _strip_reference_from_text(text, reference)
-        return clean_text, reference
-
-
-@router.get("/today", response_model=DailyVerseResponse)
-async def get_today_verse() -> DailyVerseResponse:
-    today = date.today()
-    with get_session() as session:
-        stmt = select(DailyVerse).where(DailyVerse.date == today)
-        existing = session.exec(stmt).first()
-        if existing:
-            display_text = _strip_reference_from_text(existing.verse_text or "", existing.reference)
-            return DailyVerseResponse(
-                date=existing.date,
-                reference=existing.reference,
-                verse=display_text,
-                reflection=existing.reflection,
-                encouragement=existing.encouragement,
-            )
+async def _fetch_bible_verse(url: str = BIBLE_API_URL) -> tuple[str, Optional[str]]:
+    try:
+        text = (await get_text(url, breaker=_BIBLE_BREAKER)).strip()
+    except UpstreamError as e:
+        raise HTTPException(status_code=502, detail="Bible API unavailable") from e
+    if not text:
+        raise HTTPException(status_code=502, detail="Bible API returned no verse")
+    reference = _parse_reference(text)
+    clean_text = _strip_reference_from_text(text, reference)
+    return clean_text, reference
 
-    # Not found: fetch new
-    verse_text, reference = await _fetch_bible_verse()
-    ai = generate_ai_reflection(verse_text=verse_text, reference=reference)
 
-    dv = DailyVerse(
-        date=today,
-        verse_text=verse_text,
-        reference=reference,
-        reflection=ai.get("reflection"),
-        encouragement=ai.get("encouragement"),
-    )
+def bible_api_status() -> Dict[str, object]:
+    return _BIBLE_BREAKER.stats()
 
-    with get_session() as session:
-        session.add(dv)
-        session.commit()
 
+# Rendered responses per date, plus the in-flight build for each date so
+# concurrent misses share one fetch + generate instead of racing.
+_VERSE_CACHE = TTLCache(max_entries=8, ttl_seconds=36 * 3600)
+_INFLIGHT: Dict[date, "asyncio.Future[DailyVerseResponse]"] = {}
+# The same responses pre-serialized and precompressed, served by /verse/today,
+# as (artifact, is_stale_fallback)
+_ARTIFACTS = TTLCache(max_entries=8, ttl_seconds=36 * 3600)
+
+
+def _to_response(dv: DailyVerse) -> DailyVerseResponse:
     return DailyVerseResponse(
-        date=today,
-        reference=reference,
-        verse=verse_text,
+        date=dv.date,
+        reference=dv.reference,
+        verse=_strip_reference_from_text(dv.verse_text or "", dv.reference),
         reflection=dv.reflection,
         encouragement=dv.encouragement,
     )
+
+
+def _render_artifact(day: date, resp: DailyVerseResponse) -> Tuple[Precompressed, bool]:
+    stale = resp.date != day
+    entry = (Precompressed.render(resp.model_dump_json().encode("utf-8")), stale)
+    _ARTIFACTS.set(day, entry, ttl_seconds=_STALE_TTL_SECONDS if stale else None)
+    return entry
+
+
+def _write_artifact(day: date, artifact: Precompressed) -> None:
+    """Write each encoding to VERSE_ARTIFACT_DIR atomically (temp file + rename)."""
+    files = {f"{day.isoformat()}.json": artifact.body}
+    files.update({f"{day.isoformat()}.json.{'gz' if c == 'gzip' else c}": b for c, b in artifact.variants.items()})
+    os.makedirs(VERSE_ARTIFACT_DIR, exist_ok=True)
+    for name, data in files.items():
+        fd, tmp = tempfile.mkstemp(dir=VERSE_ARTIFACT_DIR, prefix=f".{name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, os.path.join(VERSE_ARTIFACT_DIR, name))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _read_artifact(day: date) -> Optional[Tuple[Precompressed, bool]]:
+    if not VERSE_ARTIFACT_DIR:
+        return None
+    try:
+        with open(os.path.join(VERSE_ARTIFACT_DIR, f"{day.isoformat()}.json"), "rb") as f:
+            body = f.read()
+    except OSError:
+        return None
+    entry = (Precompressed.render(body), False)
+    _ARTIFACTS.set(day, entry)
+    return entry
+
+
+async def _publish(day: date, resp: DailyVerseResponse) -> None:
+    artifact, _ = _render_artifact(day, resp)
+    if VERSE_ARTIFACT_DIR:
+        try:
+            await asyncio.to_thread(_write_artifact, day, artifact)
+        except OSError as e:
+            logger.warning("Could not write verse artifact for %s: %r", day, e)
+
+
+async def _load_verse(day: date) -> Optional[DailyVerse]:
+    async with async_session_maker() as session:
+        return (await session.exec(select(DailyVerse).where(DailyVerse.date == day))).first()
+
+
+async def _load_latest_verse() -> Optional[DailyVerse]:
+    async with async_session_maker() as session:
+        return (await session.exec(select(DailyVerse).order_by(DailyVerse.date.desc()).limit(1))).first()
+
+
+async def _insert_verse(dv: DailyVerse) -> DailyVerse:
+    """Insert a DailyVerse, returning the stored row if another writer won."""
+    async with async_session_maker() as session:
+        session.add(dv)
+        try:
+            await session.commit()
+            await session.refresh(dv)
+            return dv
+        except IntegrityError:
+            await session.rollback()
+    existing = await _load_verse(dv.date)
+    if existing is None:  # pragma: no cover - unique violation on something else
+        raise HTTPException(status_code=500, detail="Could not store daily verse")
+    return existing
+
+
+async def _load_or_create_verse(day: date) -> DailyVerseResponse:
+    existing = await _load_verse(day)
+    if existing is None:
+        verse_text, reference = await _fetch_bible_verse(
+            BIBLE_API_URL if day == date.today() else BIBLE_API_PREFETCH_URL
+        )
+        ai = await agenerate_ai_reflection(verse_text=verse_text, reference=reference)
+        existing = await _insert_verse(
+            DailyVerse(
+                date=day,
+                verse_text=verse_text,
+                reference=reference,
+                reflection=ai.get("reflection"),
+                encouragement=ai.get("encouragement"),
+            )
+        )
+    resp = _to_response(existing)
+    _VERSE_CACHE.set(day, resp)
+    await _publish(day, resp)
+    return resp
+
+
+def _build(day: date) -> "asyncio.Future[DailyVerseResponse]":
+    task = _INFLIGHT.get(day)
+    if task is None:
+        task = asyncio.ensure_future(_load_or_create_verse(day))
+        _INFLIGHT[day] = task
+        task.add_done_callback(lambda _t, d=day: _INFLIGHT.pop(d, None))
+        # Nobody may be awaiting a build that outlived its requests
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return task
+
+
+async def get_daily_verse(day: date, stale_after: Optional[float] = VERSE_STALE_AFTER_SECONDS) -> DailyVerseResponse:
+    """Return the verse for ``day``, building it at most once per process.
+
+    If the build fails, or takes longer than ``stale_after`` seconds, the most
+    recently stored verse is served instead (for about a minute) while the
+    build carries on; 502 only when nothing has ever been stored. Pass
+    ``stale_after=None`` to always wait for the real verse.
+    """
+    cached = _VERSE_CACHE.get(day)
+    if cached is not None:
+        return cached
+    task = _build(day)
+    try:
+        # Shield so a timeout or cancelled request does not cancel the shared build
+        return await asyncio.wait_for(asyncio.shield(task), timeout=stale_after)
+    except (HTTPException, asyncio.TimeoutError) as e:
+        stale = await _load_latest_verse()
+        if stale is None:
+            if isinstance(e, HTTPException):
+                raise
+            return await asyncio.shield(task)
+        logger.warning("Serving stored verse for %s instead of %s: %r", stale.date, day, e)
+        resp = _to_response(stale)
+        if task.done():
+            # Failed build: hold the stale answer briefly so an outage isn't
+            # retried on every request (the circuit breaker also limits that)
+            _VERSE_CACHE.set(day, resp, ttl_seconds=_STALE_TTL_SECONDS)
+        return resp
+
+
+async def prefill_verses(days: int = VERSE_PREFETCH_DAYS) -> Dict[str, int]:
+    """Make sure verses exist from yesterday through ``days`` days ahead (UTC).
+
+    Yesterday and tomorrow cover clients whose local date differs from the
+    server's. Failed days are left for the next run; the HTTP layer already
+    retries and backs off.
+    """
+    today = datetime.now(timezone.utc).date()
+    out = {"ready": 0, "built": 0, "failed": 0}
+    for offset in range(-1, days + 1):
+        day = today + timedelta(days=offset)
+        if _ARTIFACTS.get(day) is not None:
+            out["ready"] += 1
+            continue
+        existing = await _load_verse(day)
+        if existing is not None:
+            # Stored by an earlier process: render it so requests never need the DB
+            resp = _to_response(existing)
+            _VERSE_CACHE.set(day, resp)
+            await _publish(day, resp)
+            out["ready"] += 1
+            continue
+        try:
+            await asyncio.shield(_build(day))
+            out["built"] += 1
+        except Exception as e:
+            out["failed"] += 1
+            logger.warning("Verse prefetch for %s failed: %r", day, e)
+    return out
+
+
+async def get_verse_artifact(day: date) -> Tuple[Precompressed, bool]:
+    """Pre-rendered verse for ``day`` and whether it is a stale fallback.
+
+    Only a cold cache touches the DB (or the Bible API).
+    """
+    entry = _ARTIFACTS.get(day) or _read_artifact(day)
+    if entry is not None:
+        return entry
+    resp = await get_daily_verse(day)
+    # A real build publishes its own artifact; render only the stale fallback
+    return _ARTIFACTS.get(day) or _render_artifact(day, resp)
+
+
+def _client_now(tz: Optional[str], utc_offset: Optional[int]) -> datetime:
+    """Client wall-clock time as a naive datetime."""
+    if tz:
+        try:
+            return datetime.now(ZoneInfo(tz)).replace(tzinfo=None)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise HTTPException(status_code=400, detail="Unknown timezone")
+    if utc_offset is not None:
+        return (datetime.now(timezone.utc) + timedelta(minutes=utc_offset)).replace(tzinfo=None)
+    return datetime.now()
+
+
+@router.get(
+    "/today",
+    response_model=DailyVerseResponse,
+    responses={304: {"description": "Client copy is current (If-None-Match)"}},
+)
+async def get_today_verse(
+    request: Request,
+    tz: Optional[str] = Query(default=None, max_length=64, description="IANA timezone, e.g. America/New_York"),
+    utc_offset: Optional[int] = Query(default=None, ge=-14 * 60, le=14 * 60, description="Minutes east of UTC"),
+) -> Response:
+    """Verse for the client's current date (server date when neither is given).
+
+    Served from a precompressed artifact with a strong ETag; clients may cache
+    it until their local midnight.
+    """
+    now = _client_now(tz, utc_offset)
+    day = now.date()
+    artifact, stale = await get_verse_artifact(day)
+    midnight = datetime.combine(day + timedelta(days=1), datetime.min.time())
+    max_age = int(_STALE_TTL_SECONDS) if stale else max(0, int((midnight - now).total_seconds()))
+    return artifact.response(request, f"public, max-age={max_age}")
@@ -12,6 +12,25 @@ class JournalCreate(BaseModel):
     title: Optional[str] = None
 
 
+class JournalImportItem(JournalCreate):
+    # Original date when migrating from another app; defaults to now
+    created_at: Optional[datetime] = None
+
+
+class JournalBatchItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class JournalBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: List[JournalBatchItemResult]
+    # /import stopped at JOURNAL_IMPORT_MAX_ITEMS; later lines were not read
+    truncated: bool = False
+
+
 class JournalRead(BaseModel):
     id: int
     content: str
@@ -24,6 +43,16 @@ class JournalRead(BaseModel):
         from_attributes = True
 
 
+class JournalSummary(BaseModel):
+    id: int
+    created_at: datetime
+    private: bool
+    mood: Optional[str]
+    title: Optional[str]
+    preview: str
+    content_length: int
+
+
 class JournalUpdate(BaseModel):
     content: Optional[str] = None
     private: Optional[bool] = None
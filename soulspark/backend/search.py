@@ -0,0 +1,184 @@
+"""Per-user relevance search over encrypted journal entries.
+
+Entries are ranked with BM25 over the blind keyword index (``journalterm``,
+see utils/blind_index), which is kept current on every journal write. For
+``/journal/ask`` the best entries are then decrypted, cut into chunks and
+re-ranked in memory so only the passages that match the question reach the
+prompt.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import delete, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .models.journal import JournalEntry, JournalTerm
+from .utils.blind_index import query_hashes, term_hashes, tokenize
+from .utils.cache import TTLCache
+from .utils.crypto import adecrypt_many
+
+_K1 = 1.2
+_B = 0.75
+
+ASK_RETRIEVAL_ENTRIES = int(os.getenv("ASK_RETRIEVAL_ENTRIES", "8"))
+ASK_TOP_CHUNKS = int(os.getenv("ASK_TOP_CHUNKS", "6"))
+ASK_CHUNK_CHARS = int(os.getenv("ASK_CHUNK_CHARS", "600"))
+
+# Users whose entries are all indexed, so searches skip the backfill check
+_INDEXED_USERS = TTLCache(max_entries=4096, ttl_seconds=3600)
+
+
+def _bm25(tf: int, df: int, total: int, length: float, avg_length: float) -> float:
+    idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+    norm = 1 - _B + _B * (length / avg_length if avg_length else 1.0)
+    return idf * tf * (_K1 + 1) / (tf + _K1 * norm)
+
+
+async def index_entry(session: AsyncSession, entry: JournalEntry, content_plain: str) -> None:
+    """Replace the entry's index rows and term count; the caller commits."""
+    await session.exec(delete(JournalTerm).where(JournalTerm.entry_id == entry.id))
+    terms = term_hashes(entry.user_id, f"{entry.title or ''}\n{content_plain}")
+    session.add_all(
+        JournalTerm(user_id=entry.user_id, term=term, entry_id=entry.id, tf=tf) for term, tf in terms.items()
+    )
+    entry.term_count = sum(terms.values())
+    session.add(entry)
+
+
+async def unindex_entry(session: AsyncSession, entry_id: int) -> None:
+    await session.exec(delete(JournalTerm).where(JournalTerm.entry_id == entry_id))
+
+
+async def ensure_indexed(session: AsyncSession, user_id: int, batch_size: int = 200) -> int:
+    """Index the user's entries written before search existed; returns how many.
+
+    Every write since sets ``term_count``, so NULL marks an unindexed entry.
+    Runs before a user's searches until none are left, committing per batch.
+    """
+    if _INDEXED_USERS.get(user_id):
+        return 0
+    indexed = 0
+    while True:
+        rows = list(
+            (
+                await session.exec(
+                    select(JournalEntry)
+                    .where(JournalEntry.user_id == user_id, JournalEntry.term_count.is_(None))
+                    .order_by(JournalEntry.id)
+                    .limit(batch_size)
+                )
+            ).all()
+        )
+        if not rows:
+            break
+        for r, plain in zip(rows, await adecrypt_many([r.content for r in rows])):
+            await index_entry(session, r, plain)
+        await session.commit()
+        indexed += len(rows)
+    _INDEXED_USERS.set(user_id, True)
+    return indexed
+
+
+async def rank_entries(
+    session: AsyncSession,
+    user_id: int,
+    query: str,
+    include_private: bool = True,
+    limit: int = 20,
+) -> List[int]:
+    """Ids of the user's entries matching ``query``, best first.
+
+    Entries matching more distinct query words come first, then BM25 score.
+    One indexed postings lookup plus one aggregate over the user's entries.
+    """
+    terms = query_hashes(user_id, query)
+    if not terms:
+        return []
+    stmt = (
+        select(JournalTerm.entry_id, JournalTerm.term, JournalTerm.tf, JournalEntry.term_count)
+        .join(JournalEntry, JournalEntry.id == JournalTerm.entry_id)
+        .where(JournalTerm.user_id == user_id, JournalTerm.term.in_(terms))
+    )
+    if not include_private:
+        stmt = stmt.where(JournalEntry.private == False)  # noqa: E712
+    postings = list((await session.exec(stmt)).all())
+    if not postings:
+        return []
+    total, avg_length = (
+        await session.exec(
+            select(func.count(), func.avg(JournalEntry.term_count)).where(JournalEntry.user_id == user_id)
+        )
+    ).one()
+    df: Dict[str, int] = Counter(term for _, term, _, _ in postings)
+    matched: Dict[int, int] = defaultdict(int)
+    score: Dict[int, float] = defaultdict(float)
+    for entry_id, term, tf, length in postings:
+        matched[entry_id] += 1
+        score[entry_id] += _bm25(tf, df[term], total, float(length or avg_length or 0), float(avg_length or 0))
+    return sorted(matched, key=lambda i: (matched[i], score[i], i), reverse=True)[:limit]
+
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def chunk_text(text: str, max_chars: int = ASK_CHUNK_CHARS) -> List[str]:
+    """Split on paragraphs, then pack sentences into chunks of ``max_chars``."""
+    chunks: List[str] = []
+    for para in _PARAGRAPH_RE.split(text or ""):
+        para = para.strip()
+        if not para:
+            continue
+        if len(para) <= max_chars:
+            chunks.append(para)
+            continue
+        current = ""
+        for sentence in _SENTENCE_RE.split(para):
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current} {sentence}".strip()
+            # A single run-on sentence still gets cut to size
+            while len(current) > max_chars:
+                chunks.append(current[:max_chars])
+                current = current[max_chars:]
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def best_chunks(
+    question: str, docs: Sequence[Tuple[int, str]], k: int = ASK_TOP_CHUNKS
+) -> List[Tuple[int, str]]:
+    """Up to ``k`` (doc id, chunk) pairs for ``question`` by BM25 over all chunks.
+
+    Returned in document order, so passages from one entry stay together.
+    """
+    chunks = [(i, pos, c) for i, text in docs for pos, c in enumerate(chunk_text(text))]
+    if len(chunks) <= k:
+        return [(i, c) for i, _, c in chunks]
+    q = set(tokenize(question))
+    tokens = [Counter(tokenize(c)) for _, _, c in chunks]
+    avg_length = sum(sum(t.values()) for t in tokens) / len(tokens)
+    df = Counter(term for t in tokens for term in q & t.keys())
+    scores = [
+        sum(_bm25(t[term], df[term], len(chunks), sum(t.values()), avg_length) for term in q & t.keys())
+        for t in tokens
+    ]
+    order = {i: n for n, (i, _) in enumerate(docs)}
+    # Chunks sharing no word with the question only pad the prompt; if none
+    # match (e.g. the recent-entries fallback) take each entry's opening first
+    hits = [n for n in range(len(chunks)) if scores[n] > 0]
+    if hits:
+        top = sorted(hits, key=lambda n: scores[n], reverse=True)[:k]
+    else:
+        top = sorted(range(len(chunks)), key=lambda n: (chunks[n][1], order[chunks[n][0]]))[:k]
+    top.sort(key=lambda n: (order[chunks[n][0]], chunks[n][1]))
+    return [(chunks[n][0], chunks[n][2]) for n in top]
+
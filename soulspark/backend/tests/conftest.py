@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+
+# Must be set before the app (and its engines) are imported
+_DB_DIR = tempfile.mkdtemp(prefix="soulspark-tests-")
+os.environ["SOULSPARK_DB_PATH"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["GEMINI_FAKE"] = "1"
+os.environ["TOKEN_ISSUER_SECRET"] = "test-admin"
+os.environ["JOURNAL_KEY"] = "test-journal-key"
+os.environ["JWT_SECRET"] = "test-jwt-secret-of-at-least-32-bytes"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from ..routes import verse as verse_routes  # noqa: E402
+
+
+async def _fake_bible_verse(*args, **kwargs):
+    return "For God so loved the world", "John 3:16"
+
+
+# Startup seeds today's verse; keep the tests off the network
+verse_routes._fetch_bible_verse = _fake_bible_verse
+
+from ..main import app  # noqa: E402
+
+ADMIN = {"X-Admin-Secret": "test-admin"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def auth(client):
+    """Bearer headers for a fresh user."""
+
+    def make(email: str):
+        resp = client.post("/auth/issue", json={"email": email}, headers=ADMIN)
+        assert resp.status_code == 200, resp.text
+        return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    return make
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from ..utils import ai
+
+
+def test_invalidate_answer_cache_changes_key_and_stays_bounded(monkeypatch):
+    monkeypatch.setattr(ai, "_ANSWER_CACHE", None)
+    monkeypatch.setattr(ai, "_ANSWER_GEN", None)
+    monkeypatch.setenv("ANSWER_CACHE_SIZE", "4")
+
+    before = ai._answer_cache_key("journal", "u1", "Why?", "ctx")
+    ai.invalidate_answer_cache("u1")
+    after = ai._answer_cache_key("journal", "u1", "Why?", "ctx")
+    assert before != after
+    assert ai._answer_cache_key("journal", "u2", "Why?", "ctx").split(":")[2] == "0"
+
+    for i in range(50):
+        ai.invalidate_answer_cache(f"other-{i}")
+    assert len(ai._ANSWER_GEN) == 4
+    assert ai._answer_cache_key("journal", "u1", "Why?", "ctx") != after
+    # Generation tokens are never reused, so a re-bump can't match an old key
+    ai.invalidate_answer_cache("u1")
+    assert ai._answer_cache_key("journal", "u1", "Why?", "ctx") not in (before, after)
+
+
+class _ChunkedModel(ai._FakeModel):
+    def __init__(self, *chunks: str) -> None:
+        super().__init__()
+        self.chunks = chunks
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        async def gen():
+            for chunk in self.chunks:
+                yield ai._FakeResponse(chunk)
+
+        return gen()
+
+
+def _collect(client, model):
+    async def run():
+        return [e async for e in ai._stream_sanitized(model, "p", ai._sanitize_text, "", "")]
+
+    return client.portal.call(run)
+
+
+def test_stream_keeps_going_after_sanitizing_rewrites_emitted_text(client):
+    # "One" goes out before "Sentence:" arrives and turns it into a label
+    chunks = ("Hello One ", "Sentence God is ", "near to you ", "today.")
+    events = _collect(client, _ChunkedModel(*chunks))
+
+    shown = ""
+    for event in events[:-1]:
+        shown = event["replace"] if "replace" in event else shown + event["delta"]
+    assert any("replace" in e for e in events)
+    assert shown == "Hello God is near to you"
+    assert events[-1] == {"answer": "Hello God is near to you today."}
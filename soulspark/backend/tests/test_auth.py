@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from sqlmodel import Session, select
+
+from ..database import engine
+from ..models.user import User
+
+
+def test_token_of_deleted_user_is_rejected(client, auth, monkeypatch):
+    monkeypatch.delenv("AUTH_CLAIMS_ONLY", raising=False)
+    headers = auth("deleted@example.com")
+    with Session(engine) as session:
+        session.delete(session.exec(select(User).where(User.email == "deleted@example.com")).one())
+        session.commit()
+
+    resp = client.get("/journal", headers=headers)
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "User not found"
+
+
+def test_claims_only_mode_skips_the_user_lookup(client, auth, monkeypatch):
+    monkeypatch.setenv("AUTH_CLAIMS_ONLY", "1")
+    headers = auth("claims-only@example.com")
+    with Session(engine) as session:
+        session.delete(session.exec(select(User).where(User.email == "claims-only@example.com")).one())
+        session.commit()
+
+    assert client.get("/journal", headers=headers).status_code == 200
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import base64
+import os
+
+import pytest
+
+from ..utils import crypto
+from ..utils.crypto import KEYS, decrypt_many, decrypt_text, encrypt_text, token_key_id
+
+
+def _key() -> str:
+    return base64.urlsafe_b64encode(os.urandom(32)).decode("ascii")
+
+
+@pytest.fixture
+def keyring(monkeypatch):
+    """Configure JOURNAL_KEY plus JOURNAL_KEYS and reload the key manager."""
+
+    def configure(keys: str, active: str = "", legacy: str = "") -> None:
+        monkeypatch.setenv("JOURNAL_KEY", legacy or _key())
+        monkeypatch.setenv("JOURNAL_KEYS", keys)
+        if active:
+            monkeypatch.setenv("JOURNAL_ACTIVE_KEY_ID", active)
+        else:
+            monkeypatch.delenv("JOURNAL_ACTIVE_KEY_ID", raising=False)
+        KEYS.reset()
+
+    # Short texts only: compression (enc3) is covered in test_crypto_compress
+    monkeypatch.setattr(crypto, "_COMPRESSOR", None)
+    monkeypatch.setenv("JOURNAL_COMPRESS", "off")
+    yield configure
+    KEYS.reset()
+
+
+def test_enc2_round_trip(keyring):
+    keyring(f"k1:{_key()}")
+    token = encrypt_text("hello, journal")
+    assert token.startswith("enc2:k1:")
+    assert decrypt_text(token) == "hello, journal"
+    # A fresh nonce every time
+    assert encrypt_text("hello, journal") != token
+
+
+def test_old_tokens_decrypt_after_rotation(keyring):
+    k1, k2 = _key(), _key()
+    keyring(f"k1:{k1}")
+    old = encrypt_text("written under k1")
+
+    keyring(f"k1:{k1},k2:{k2}")
+    new = encrypt_text("written under k2")
+    assert token_key_id(new) == "k2"
+    assert decrypt_text(old) == "written under k1"
+    assert decrypt_text(new) == "written under k2"
+
+
+def test_legacy_enc1_and_fernet_tokens_still_decrypt(keyring):
+    legacy = _key()
+    keyring(f"k1:{_key()}", legacy=legacy)
+    nonce = os.urandom(12)
+    ct = crypto.AESGCM(base64.urlsafe_b64decode(legacy)).encrypt(nonce, b"old enc1 entry", None)
+    enc1 = "enc1:" + base64.urlsafe_b64encode(nonce + ct).decode("ascii").rstrip("=")
+    fernet = crypto._load_fernet().encrypt(b"old fernet entry").decode("ascii")
+
+    assert decrypt_text(enc1) == "old enc1 entry"
+    assert decrypt_text(fernet) == "old fernet entry"
+
+
+def test_tampered_version_or_kid_is_rejected(keyring):
+    shared = _key()
+    # Same secret under two ids, so only the AAD binding can tell them apart
+    keyring(f"k1:{shared},k2:{shared}", active="k1")
+    token = encrypt_text("bound to enc2:k1")
+    raw = token.split(":", 2)[2]
+
+    for forged in (f"enc2:k2:{raw}", f"enc3:k1:{raw}", f"enc2:nope:{raw}"):
+        assert decrypt_text(forged) == forged
+    assert decrypt_text(token) == "bound to enc2:k1"
+
+
+def test_failed_key_derivation_is_cached(keyring, monkeypatch):
+    calls = []
+
+    def derive(secret):
+        calls.append(secret)
+        return None
+
+    monkeypatch.setattr(crypto, "_key_bytes_from_secret", derive)
+    keyring("bad:not-a-key")
+    token = "enc2:bad:AAAAAAAAAAAAAAAAAAAAAAAA"
+    assert decrypt_text(token) == token
+    assert decrypt_text(token) == token
+    assert calls.count("not-a-key") == 1
+
+
+@pytest.mark.parametrize("size", [10, 200])
+def test_decrypt_many_matches_decrypt_text(keyring, size):
+    assert crypto._PARALLEL_THRESHOLD == 64
+    keyring(f"k1:{_key()}")
+    plain = [f"entry {i}" for i in range(size)]
+    tokens = [encrypt_text(p) if i % 3 else p for i, p in enumerate(plain)]
+    tokens[0] = "enc2:missing:AAAA"
+
+    out = decrypt_many(tokens)
+    assert out == [decrypt_text(t) for t in tokens]
+    assert out[1:] == plain[1:]
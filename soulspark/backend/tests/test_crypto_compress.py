@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import base64
+import os
+
+import pytest
+
+from ..utils import crypto
+from ..utils.crypto import KEYS, decrypt_text, encrypt_text
+
+TEXT = "Today I walked by the river and prayed for patience with my family. " * 20
+
+
+@pytest.fixture
+def compressor(monkeypatch, tmp_path):
+    """Reload the compressor (and keys) from env set by the test."""
+    monkeypatch.setenv("JOURNAL_KEYS", "k1:" + base64.urlsafe_b64encode(os.urandom(32)).decode("ascii"))
+    monkeypatch.delenv("JOURNAL_ACTIVE_KEY_ID", raising=False)
+    KEYS.reset()
+
+    def configure(codec: str = "zlib", dictionary: bytes = b"") -> None:
+        monkeypatch.setenv("JOURNAL_COMPRESS", codec)
+        if dictionary:
+            path = tmp_path / f"dict-{len(dictionary)}"
+            path.write_bytes(dictionary)
+            monkeypatch.setenv("JOURNAL_COMPRESS_DICT", str(path))
+        else:
+            monkeypatch.delenv("JOURNAL_COMPRESS_DICT", raising=False)
+        monkeypatch.setattr(crypto, "_COMPRESSOR", None)
+
+    yield configure
+    KEYS.reset()
+
+
+def _seal_enc3(framed: bytes) -> str:
+    """An enc3 token around an arbitrary compressed frame."""
+    kid, aes = KEYS.active()
+    nonce = os.urandom(12)
+    ct = aes.encrypt(nonce, framed, f"enc3:{kid}".encode("ascii"))
+    return f"enc3:{kid}:" + base64.urlsafe_b64encode(nonce + ct).decode("ascii").rstrip("=")
+
+
+def test_enc3_round_trip_without_dictionary(compressor):
+    compressor("zlib")
+    token = encrypt_text(TEXT)
+    assert token.startswith("enc3:k1:")
+    assert len(token) < len(TEXT)
+    assert decrypt_text(token) == TEXT
+    # Short texts are not worth compressing
+    assert encrypt_text("short").startswith("enc2:")
+
+
+def test_enc3_round_trip_with_dictionary(compressor):
+    compressor("zlib", dictionary=b"walked by the river and prayed for patience with my family " * 4)
+    token = encrypt_text(TEXT)
+    assert token.startswith("enc3:k1:")
+    assert decrypt_text(token) == TEXT
+
+
+@pytest.mark.parametrize("later_dictionary", [b"", b"a different dictionary entirely " * 4])
+def test_dictionary_token_fails_cleanly_without_its_dictionary(compressor, later_dictionary):
+    compressor("zlib", dictionary=b"walked by the river and prayed for patience with my family " * 4)
+    token = encrypt_text(TEXT)
+
+    compressor("zlib", dictionary=later_dictionary)
+    # Undecryptable tokens come back unchanged, never as garbage text
+    assert decrypt_text(token) == token
+
+
+def test_zstd_token_without_zstandard_installed(compressor, monkeypatch):
+    compressor("zlib")
+    token = _seal_enc3(bytes([crypto._CODEC_ZSTD]) + b"\x28\xb5\x2f\xfd zstd frame")
+    monkeypatch.setattr(crypto, "zstandard", None)
+    assert decrypt_text(token) == token
+
+
+def test_zstd_requested_without_zstandard_falls_back_to_zlib(compressor, monkeypatch):
+    monkeypatch.setattr(crypto, "zstandard", None)
+    compressor("zstd")
+    token = encrypt_text(TEXT)
+    assert token.startswith("enc3:")
+    assert decrypt_text(token) == TEXT
+
+
+def test_zstd_round_trip(compressor):
+    pytest.importorskip("zstandard")
+    compressor("zstd")
+    token = encrypt_text(TEXT)
+    assert token.startswith("enc3:")
+    assert decrypt_text(token) == TEXT
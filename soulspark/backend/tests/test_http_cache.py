@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from ..utils import http_cache
+from ..utils.http_cache import CompressionMiddleware, Precompressed
+
+BIG = b'{"text": "' + b"grace " * 1000 + b'"}'
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big():
+        return Response(BIG, media_type="application/json")
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(BIG), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/zip")
+    def zipped():
+        return Response(BIG, media_type="application/zip")
+
+    return app
+
+
+def test_precompressed_etags_differ_per_coding():
+    artifact = Precompressed.render(BIG)
+    assert len(set(artifact.etags.values())) == len(artifact.etags)
+    assert artifact.choose("gzip") == "gzip"
+    assert artifact.choose("identity") == "identity"
+    assert artifact.choose("gzip;q=0") == "identity"
+
+
+def test_middleware_compresses_large_bodies_only(monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    client = TestClient(_app())
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert int(resp.headers["content-length"]) < len(BIG)
+    assert resp.content == BIG
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/zip", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_middleware_leaves_encoded_responses_alone(monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    resp = TestClient(_app()).get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.content == BIG  # decoded exactly once
+
+
+def test_middleware_prefers_brotli():
+    pytest.importorskip("brotli")
+    resp = TestClient(_app()).get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["content-encoding"] == "br"
+    assert resp.content == BIG
+
+
+def test_verse_etag_matches_the_coding_sent(client):
+    gz = client.get("/verse/today", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/verse/today", headers={"Accept-Encoding": "identity"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.headers["etag"] != plain.headers["etag"]
+    again = client.get("/verse/today", headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]})
+    assert again.status_code == 304
+    # A gzip validator doesn't validate the identity bytes
+    other = client.get("/verse/today", headers={"Accept-Encoding": "identity", "If-None-Match": gz.headers["etag"]})
+    assert other.status_code == 200
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from sqlmodel import Session, select
+
+from ..database import engine
+from ..models.journal import JournalEntry
+from ..models.user import User
+from ..utils.crypto import decrypt_text, is_probably_encrypted
+
+_FIELDS = ("content", "preview", "summary")
+
+
+def test_migrate_encrypt_leaves_no_plaintext_column(client, auth):
+    headers = auth("migrate@example.com")
+    with Session(engine) as session:
+        uid = session.exec(select(User.id).where(User.email == "migrate@example.com")).one()
+        session.add_all(
+            [
+                JournalEntry(
+                    user_id=uid,
+                    content="my private confession text",
+                    preview="my private confession text",
+                    summary="a private summary",
+                ),
+                JournalEntry(user_id=uid, content="short", preview="short"),
+            ]
+        )
+        session.commit()
+
+    resp = client.post("/journal/migrate_encrypt", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["updated"] == 2
+
+    with Session(engine) as session:
+        rows = session.exec(select(JournalEntry).where(JournalEntry.user_id == uid)).all()
+        for row in rows:
+            for field in _FIELDS:
+                value = getattr(row, field)
+                if value is not None:
+                    assert is_probably_encrypted(value), (field, value)
+        assert sorted(decrypt_text(r.content) for r in rows) == ["my private confession text", "short"]
+
+    # Nothing left to seal on a second run
+    assert client.post("/journal/migrate_encrypt", headers=headers).json()["updated"] == 0
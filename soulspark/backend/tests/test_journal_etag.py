@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def entry(client, auth):
+    headers = auth(f"etag-{uuid.uuid4().hex[:8]}@example.com")
+    resp = client.post("/journal", json={"content": "first draft", "title": "Morning"}, headers=headers)
+    return headers, resp.json()["id"]
+
+
+def test_if_none_match_returns_empty_304(client, entry):
+    headers, entry_id = entry
+    for path in ("/journal", f"/journal/{entry_id}"):
+        first = client.get(path, headers=headers)
+        etag = first.headers["etag"]
+        resp = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+
+def test_etag_changes_after_update(client, entry):
+    headers, entry_id = entry
+    list_etag = client.get("/journal", headers=headers).headers["etag"]
+    entry_etag = client.get(f"/journal/{entry_id}", headers=headers).headers["etag"]
+
+    client.put(f"/journal/{entry_id}", json={"content": "second draft"}, headers=headers)
+
+    resp = client.get(f"/journal/{entry_id}", headers={**headers, "If-None-Match": entry_etag})
+    assert resp.status_code == 200
+    assert resp.json()["content"] == "second draft"
+    assert resp.headers["etag"] != entry_etag
+    resp = client.get("/journal", headers={**headers, "If-None-Match": list_etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != list_etag
+
+
+def test_summary_and_full_views_have_different_etags(client, entry):
+    headers, _ = entry
+    full = client.get("/journal", headers=headers).headers["etag"]
+    summary = client.get("/journal", params={"view": "summary"}, headers=headers).headers["etag"]
+    assert full != summary
+    resp = client.get("/journal", params={"view": "summary"}, headers={**headers, "If-None-Match": full})
+    assert resp.status_code == 200
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import io
+import zipfile
+
+
+def test_zip_export_handles_entries_before_1980(client, auth):
+    headers = auth("export-old@example.com")
+    body = b'{"content": "old", "created_at": "1975-06-01T12:00:00Z"}\n{"content": "new"}\n'
+    assert client.post("/journal/import", content=body, headers=headers).json()["created"] == 2
+
+    resp = client.get("/journal/export", params={"format": "zip"}, headers=headers)
+    assert resp.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        infos = zf.infolist()
+        assert len(infos) == 2
+        old = next(i for i in infos if i.filename.startswith("1975-06-01"))
+        assert old.date_time == (1980, 1, 1, 0, 0, 0)
+        assert zf.read(old).decode().endswith("old\n")
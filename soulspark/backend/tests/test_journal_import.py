@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+
+def test_import_converts_offset_timestamps_to_utc(client, auth):
+    headers = auth("import-tz@example.com")
+    body = b'{"content": "offset", "created_at": "2020-01-01T10:00:00+05:00"}\n'
+    resp = client.post("/journal/import", content=body, headers=headers)
+    assert resp.status_code == 200, resp.text
+    entry_id = resp.json()["results"][0]["id"]
+
+    entry = client.get(f"/journal/{entry_id}", headers=headers).json()
+    assert entry["created_at"].startswith("2020-01-01T05:00:00")
+
+
+def test_import_rejects_overlong_lines_without_buffering_them(client, auth, monkeypatch):
+    from ..routes import journal
+
+    monkeypatch.setattr(journal, "IMPORT_MAX_LINE_BYTES", 64)
+    headers = auth("import-long@example.com")
+
+    def body():
+        yield b'{"content": "before"}\n'
+        for _ in range(10):
+            yield b"x" * 50  # one line, no newline for 500 bytes
+        yield b'\n{"content": "after"}'
+
+    resp = client.post("/journal/import", content=body(), headers=headers)
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["created"] == 2
+    assert [(r["index"], r["error"] is None) for r in data["results"]] == [(1, True), (2, False), (3, True)]
+
+
+def test_import_stops_at_item_limit_and_reports_what_was_created(client, auth, monkeypatch):
+    from ..routes import journal
+
+    monkeypatch.setattr(journal, "IMPORT_MAX_ITEMS", 3)
+    monkeypatch.setattr(journal, "IMPORT_CHUNK_SIZE", 2)
+    headers = auth("import-limit@example.com")
+    body = b"".join(b'{"content": "entry %d"}\n' % i for i in range(5))
+
+    resp = client.post("/journal/import", content=body, headers=headers)
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["truncated"] is True
+    assert data["created"] == 3
+    assert len(client.get("/journal", headers=headers).json()) == 3
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def journal(client, auth):
+    """A user with 7 entries; 3 of them share one created_at."""
+    headers = auth(f"pages-{uuid.uuid4().hex[:8]}@example.com")
+    items = [{"content": f"entry {i}", "created_at": f"2024-01-0{i + 1}T09:00:00Z"} for i in range(4)]
+    items += [{"content": f"tie {i}", "created_at": "2024-02-01T09:00:00Z"} for i in range(3)]
+    resp = client.post("/journal/batch", json=items, headers=headers)
+    assert resp.json()["created"] == 7
+    newest_first = client.get("/journal", headers=headers).json()
+    return headers, [e["id"] for e in newest_first]
+
+
+def test_full_list_orders_ties_by_id(client, journal):
+    headers, ids = journal
+    entries = client.get("/journal", headers=headers).json()
+    ties = [e["id"] for e in entries if e["content"].startswith("tie")]
+    assert ids[:3] == ties == sorted(ties, reverse=True)
+
+
+def test_walk_forward_and_back(client, journal):
+    headers, ids = journal
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"before": cursor} if cursor else {})}
+        resp = client.get("/journal", params=params, headers=headers)
+        pages.append(resp)
+        cursor = resp.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert [e["id"] for p in pages for e in p.json()] == ids
+    assert [len(p.json()) for p in pages] == [2, 2, 2, 1]
+    # Only pages with older entries after them offer a next cursor
+    assert ["x-next-cursor" in p.headers for p in pages] == [True, True, True, False]
+    assert "x-prev-cursor" not in pages[0].headers
+
+    # Back from the last page, including across the created_at tie
+    back, cursor = [], pages[-1].headers["x-prev-cursor"]
+    while cursor:
+        resp = client.get("/journal", params={"limit": 2, "after": cursor}, headers=headers)
+        back.append([e["id"] for e in resp.json()])
+        cursor = resp.headers.get("x-prev-cursor")
+    assert back == [ids[4:6], ids[2:4], ids[0:2]]
+
+
+def test_exact_page_boundary_has_no_next_cursor(client, journal):
+    headers, ids = journal
+    resp = client.get("/journal", params={"limit": 7}, headers=headers)
+    assert [e["id"] for e in resp.json()] == ids
+    assert "x-next-cursor" not in resp.headers
+    resp = client.get("/journal", params={"limit": 6}, headers=headers)
+    assert "x-next-cursor" in resp.headers
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm8tcGlwZQ", "MjAyNHwx"])
+def test_malformed_cursor_is_400(client, journal, cursor):
+    headers, _ = journal
+    assert client.get("/journal", params={"limit": 2, "before": cursor}, headers=headers).status_code == 400
+    assert client.get("/journal", params={"limit": 2, "after": cursor}, headers=headers).status_code == 400
+
+
+def test_before_and_after_together_is_400(client, journal):
+    headers, _ = journal
+    first = client.get("/journal", params={"limit": 2}, headers=headers)
+    cursor = first.headers["x-next-cursor"]
+    resp = client.get("/journal", params={"before": cursor, "after": cursor}, headers=headers)
+    assert resp.status_code == 400
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from .. import main
+
+
+async def _boom() -> None:
+    raise RuntimeError("boom")
+
+
+async def _forever() -> None:
+    await asyncio.Event().wait()
+
+
+def test_failed_background_task_is_logged_and_released(client, caplog):
+    async def run():
+        task = main._spawn(_boom(), "boom")
+        assert task in main._BACKGROUND_TASKS
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+        return task
+
+    with caplog.at_level(logging.ERROR, logger=main.__name__):
+        task = client.portal.call(run)
+    assert task not in main._BACKGROUND_TASKS
+    assert "Background task boom failed" in caplog.text
+
+
+def test_shutdown_cancels_background_tasks(client):
+    async def run():
+        task = main._spawn(_forever(), "forever")
+        await main._cancel_background_tasks()
+        return task
+
+    task = client.portal.call(run)
+    assert task.cancelled()
+    assert task not in main._BACKGROUND_TASKS
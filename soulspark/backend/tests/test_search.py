@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlmodel import Session, select
+
+from ..database import engine
+from ..models.journal import JournalEntry
+from ..models.user import User
+from ..utils.crypto import encrypt_text
+
+
+def _legacy_entries(email: str, *contents: str) -> None:
+    """Entries as written before the search index existed (term_count NULL)."""
+    with Session(engine) as session:
+        uid = session.exec(select(User.id).where(User.email == email)).one()
+        session.add_all(JournalEntry(user_id=uid, content=encrypt_text(c)) for c in contents)
+        session.commit()
+
+
+def test_search_backfills_entries_written_before_the_index(client, auth):
+    email = f"search-{uuid.uuid4().hex[:8]}@example.com"
+    headers = auth(email)
+    _legacy_entries(email, "Walked along the river at dawn", "Grocery list and chores")
+    client.post("/journal", json={"content": "A new entry about the river"}, headers=headers)
+
+    hits = client.get("/journal/search", params={"q": "river"}, headers=headers).json()
+    assert sorted(h["content"] for h in hits) == ["A new entry about the river", "Walked along the river at dawn"]
+
+    with Session(engine) as session:
+        uid = session.exec(select(User.id).where(User.email == email)).one()
+        assert session.exec(
+            select(JournalEntry).where(JournalEntry.user_id == uid, JournalEntry.term_count.is_(None))
+        ).first() is None
+
+
+def test_ask_context_includes_older_unindexed_entries(client, auth):
+    from ..database import async_session_maker
+    from ..routes.qa import _retrieve_context
+
+    email = f"ask-{uuid.uuid4().hex[:8]}@example.com"
+    headers = auth(email)
+    _legacy_entries(email, "Years ago I feared the river crossing")
+    client.post("/journal", json={"content": "Today the river was calm"}, headers=headers)
+    with Session(engine) as session:
+        uid = session.exec(select(User.id).where(User.email == email)).one()
+
+    async def retrieve():
+        async with async_session_maker() as session:
+            return await _retrieve_context("what about the river?", uid, session)
+
+    context = client.portal.call(retrieve)
+    assert "feared the river crossing" in context
+    assert "river was calm" in context
@@ -1,31 +1,302 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import itertools
+import json
 import os
 import re
-from typing import Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Optional
 
 try:
     import google.generativeai as genai  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     genai = None  # type: ignore
 
+from .cache import SQLiteCache, TieredCache, TTLCache
+from .context import ASK_CONTEXT_TOKENS, truncate_to_tokens
+
 
 SYSTEM_PROMPT = (
     "You are an empathetic Christian spiritual guide. Provide comfort, encouragement, "
     "and Scripture rooted in the Bible. Always include a verse reference and summarize its meaning."
 )
 
+# Async generation limits. Deadline is per model call; concurrency is process-wide.
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "20"))
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+
+
+class _FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class _FakeModel:
+    """Offline stand-in for GenerativeModel, enabled with GEMINI_FAKE=1.
+
+    Sleeps for GEMINI_FAKE_LATENCY_MS to mimic a real round trip so the async
+    layer can be load-tested without network access or an API key.
+    """
+
+    def __init__(self, latency_s: float = 0.0) -> None:
+        self.latency_s = latency_s
+
+    def _reply(self, prompt: str) -> str:
+        if prompt.startswith("Summarize"):
+            return "The writer reflects on their day and what is weighing on them."
+        if "JSON" in prompt:
+            return json.dumps(
+                {
+                    "reflection": "God is faithful and near to those who call on Him.",
+                    "encouragement": "Rest in His care today.",
+                    "verse": "Psalm 46:1 — God is our refuge and strength, an ever-present help in trouble.",
+                    "message": "God is a present help in every trouble.",
+                }
+            )
+        return (
+            "Psalm 46:1 — God is our refuge and strength, an ever-present help in trouble.\n"
+            "Reflection: He is near in what you wrote about.\n"
+            "Encouragement: Lean on Him today."
+        )
+
+    def generate_content(self, prompt: str) -> _FakeResponse:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return _FakeResponse(self._reply(prompt))
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        if stream:
+            return self._stream(self._reply(prompt))
+        return _FakeResponse(self._reply(prompt))
+
+    async def _stream(self, text: str) -> AsyncIterator[_FakeResponse]:
+        # Emit a few words per chunk, the way the real API streams partial text
+        words = text.split(" ")
+        for i in range(0, len(words), 4):
+            if i:
+                await asyncio.sleep(self.latency_s / 10)
+            yield _FakeResponse(" ".join(words[i : i + 4]) + (" " if i + 4 < len(words) else ""))
+
+
+def _generation_config() -> Optional[Dict[str, float]]:
+    config: Dict[str, float] = {}
+    if os.getenv("GEMINI_TEMPERATURE"):
+        config["temperature"] = float(os.environ["GEMINI_TEMPERATURE"])
+    if os.getenv("GEMINI_TOP_P"):
+        config["top_p"] = float(os.environ["GEMINI_TOP_P"])
+    if os.getenv("GEMINI_MAX_OUTPUT_TOKENS"):
+        config["max_output_tokens"] = int(os.environ["GEMINI_MAX_OUTPUT_TOKENS"])
+    return config or None
+
+
+# Process-wide model registry. Built once by init_ai() (app startup) and
+# reused by every request; _get_model() falls back to lazy init for scripts.
+_MODEL = None
+_MODEL_READY: bool = False
+_AI_STATUS: Dict[str, object] = {
+    "enabled": False,
+    "model": None,
+    "warm": False,
+    "last_error": None,
+}
+
+
+def init_ai() -> None:
+    """Configure the Gemini client and build the shared model once."""
+    global _MODEL, _MODEL_READY
+    _MODEL = None
+    model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    _AI_STATUS.update(enabled=False, model=None, warm=False, last_error=None)
+    if os.getenv("GEMINI_FAKE", "").lower() in ("1", "true", "yes"):
+        _MODEL = _FakeModel(float(os.getenv("GEMINI_FAKE_LATENCY_MS", "0")) / 1000.0)
+        model_name = "fake"
+    else:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key or genai is None:
+            _AI_STATUS["last_error"] = "GEMINI_API_KEY not configured"
+        else:
+            try:
+                genai.configure(api_key=api_key)
+                _MODEL = genai.GenerativeModel(model_name, generation_config=_generation_config())
+            except Exception as e:
+                _AI_STATUS["last_error"] = str(e)
+    _AI_STATUS.update(enabled=_MODEL is not None, model=model_name if _MODEL is not None else None)
+    _MODEL_READY = True
+
+
+async def warmup_ai() -> bool:
+    """Issue one tiny request so the first user call skips connection setup."""
+    model = _get_model()
+    if model is None:
+        return False
+    try:
+        await _generate_text_async(model, "Reply with OK.", timeout=AI_TIMEOUT_SECONDS)
+    except Exception:
+        return False
+    _AI_STATUS["warm"] = True
+    return True
+
+
+def ai_status() -> Dict[str, object]:
+    """Snapshot for the health endpoint."""
+    return dict(_AI_STATUS)
+
+
+def shutdown_ai() -> None:
+    global _MODEL, _MODEL_READY, _EXECUTOR
+    _MODEL = None
+    _MODEL_READY = False
+    _AI_STATUS.update(enabled=False, warm=False)
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
+
 
 def _get_model():
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key or genai is None:
-        print('No keyyyyyy')
-        return None
+    if not _MODEL_READY:
+        init_ai()
+    return _MODEL
+
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_SEMAPHORE: Optional[asyncio.Semaphore] = None
+_SEMAPHORE_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY, thread_name_prefix="gemini")
+    return _EXECUTOR
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    # One semaphore per event loop (tests and reloads may start a fresh loop)
+    global _SEMAPHORE, _SEMAPHORE_LOOP
+    loop = asyncio.get_running_loop()
+    if _SEMAPHORE is None or _SEMAPHORE_LOOP is not loop:
+        _SEMAPHORE = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+        _SEMAPHORE_LOOP = loop
+    return _SEMAPHORE
+
+
+def _response_text(response) -> str:
+    return response.text.strip() if hasattr(response, "text") else ""
+
+
+async def _generate_text_async(model, prompt: str, timeout: Optional[float] = None) -> str:
+    """Run one model call without blocking the event loop.
+
+    Uses the model's native async API when it has one, otherwise the bounded
+    executor. Raises asyncio.TimeoutError when the deadline passes.
+    """
+    deadline = AI_TIMEOUT_SECONDS if timeout is None else timeout
+    async with _get_semaphore():
+        native = getattr(model, "generate_content_async", None)
+        if native is not None:
+            call = native(prompt)
+        else:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(_get_executor(), model.generate_content, prompt)
+        try:
+            response = await asyncio.wait_for(call, timeout=deadline)
+        except Exception as e:
+            _AI_STATUS["last_error"] = repr(e)
+            raise
+    _AI_STATUS["last_error"] = None
+    return _response_text(response)
+
+
+async def _stream_text_async(model, prompt: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+    """Yield raw text chunks as the model produces them.
+
+    The deadline applies to each chunk rather than the whole answer. Models
+    without a native async API produce a single chunk from the executor.
+    """
+    deadline = AI_TIMEOUT_SECONDS if timeout is None else timeout
+    native = getattr(model, "generate_content_async", None)
+    if native is None:
+        yield await _generate_text_async(model, prompt, timeout=deadline)
+        return
+    async with _get_semaphore():
+        try:
+            response = await asyncio.wait_for(native(prompt, stream=True), timeout=deadline)
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=deadline)
+                except StopAsyncIteration:
+                    break
+                try:
+                    text = chunk.text
+                except Exception:
+                    # Chunks without text parts (e.g. safety metadata) raise on .text
+                    text = ""
+                if text:
+                    yield text
+        except Exception as e:
+            _AI_STATUS["last_error"] = repr(e)
+            raise
+    _AI_STATUS["last_error"] = None
+
+
+async def _stream_sanitized(
+    model,
+    prompt: str,
+    sanitize: Callable[[str], str],
+    no_model_text: str,
+    error_text: str,
+    on_success: Optional[Callable[[str], None]] = None,
+) -> AsyncIterator[Dict[str, str]]:
+    """Stream sanitized deltas followed by a final event with the full answer.
+
+    Yields ``{"delta": ...}`` events and then one ``{"answer": ...}``. Only
+    text up to the last whitespace is sanitized and emitted, so a marker or
+    label split across chunks is never sent half-cleaned. If a later chunk
+    changes how already-emitted text sanitizes (e.g. it completes a label), a
+    ``{"replace": ...}`` event carries the whole corrected text and deltas
+    continue from it. The final answer is always the sanitized full text.
+    ``on_success`` receives it when the model finished without error.
+    """
+    if model is None:
+        yield {"answer": sanitize(no_model_text)}
+        return
+    raw = ""
+    emitted = ""
     try:
-        genai.configure(api_key=api_key)
-        return genai.GenerativeModel("gemini-2.5-flash")
+        async for piece in _stream_text_async(model, prompt):
+            raw += piece
+            cut = max(raw.rfind(" "), raw.rfind("\n"))
+            if cut <= 0:
+                continue
+            clean = sanitize(raw[:cut])
+            if not clean.startswith(emitted):
+                yield {"replace": clean}
+                emitted = clean
+            elif len(clean) > len(emitted):
+                yield {"delta": clean[len(emitted) :]}
+                emitted = clean
     except Exception:
-        return None
+        if not emitted:
+            yield {"answer": sanitize(error_text)}
+            return
+        yield {"answer": sanitize(raw.strip())}
+        return
+    answer = sanitize(raw.strip())
+    if on_success is not None:
+        on_success(answer)
+    yield {"answer": answer}
+
+
+def _extract_json(raw: str) -> dict:
+    start = raw.find("{")
+    end = raw.rfind("}")
+    return json.loads(raw[start : end + 1]) if start != -1 and end != -1 else json.loads(raw)
 
 
 # Basic cleanup to remove markdown/labels from AI output
@@ -70,9 +341,10 @@ def _sanitize_keep_newlines_and_labels(text: str) -> str:
     return s.strip()
 
 
-def generate_ai_reflection(verse_text: str, reference: Optional[str] = None) -> Dict[str, str]:
-    model = _get_model()
-    prompt = (
+# --- Daily verse reflection -------------------------------------------------
+
+def _reflection_prompt(verse_text: str, reference: Optional[str]) -> str:
+    return (
         f"{SYSTEM_PROMPT}\n\n"
         "Task: Given the verse below, write a concise reflection and a one-sentence encouragement.\n"
         "- Do NOT use markdown, asterisks, headings, or labels.\n"
@@ -80,50 +352,129 @@ def generate_ai_reflection(verse_text: str, reference: Optional[str] = None) ->
         f"Verse: {reference or ''} - {verse_text}\n\n"
         "Example JSON: {\"reflection\": \"Short insight...\", \"encouragement\": \"One kind sentence.\"}"
     )
-    if model is None:
-        enc = "Take heart—God is with you and will guide you today."
-        refl = (
-            "This verse reminds us of God's faithful presence and the peace He offers to those who trust Him."
-        )
-        return {"reflection": _sanitize_text(refl), "encouragement": _sanitize_text(enc)}
 
+
+def _reflection_fallback() -> Dict[str, str]:
+    enc = "Take heart—God is with you and will guide you today."
+    refl = (
+        "This verse reminds us of God's faithful presence and the peace He offers to those who trust Him."
+    )
+    return {"reflection": _sanitize_text(refl), "encouragement": _sanitize_text(enc)}
+
+
+def _parse_reflection(raw: str) -> Dict[str, str]:
+    reflection = ""
+    encouragement = ""
     try:
-        response = model.generate_content(prompt)
-        raw = response.text.strip() if hasattr(response, "text") else ""
-        import json
-        reflection = ""
-        encouragement = ""
-        try:
-            start = raw.find("{")
-            end = raw.rfind("}")
-            payload = json.loads(raw[start : end + 1]) if start != -1 and end != -1 else json.loads(raw)
-            reflection = str(payload.get("reflection", ""))
-            encouragement = str(payload.get("encouragement", ""))
-        except Exception:
-            # Fallback: split by lines
-            lines = [l for l in re.split(r"[\n\r]+", raw) if l.strip()]
-            if lines:
-                reflection = lines[0]
-                encouragement = " ".join(lines[1:])
-        reflection = _sanitize_text(reflection)
-        encouragement = _sanitize_text(encouragement)
-        if not encouragement:
-            encouragement = "Take heart—God is with you today."
-        return {"reflection": reflection, "encouragement": encouragement}
+        payload = _extract_json(raw)
+        reflection = str(payload.get("reflection", ""))
+        encouragement = str(payload.get("encouragement", ""))
     except Exception:
-        enc = "Take heart—God is with you and will guide you today."
-        refl = (
-            "This verse reminds us of God's faithful presence and the peace He offers to those who trust Him."
-        )
-        return {"reflection": _sanitize_text(refl), "encouragement": _sanitize_text(enc)}
+        # Fallback: split by lines
+        lines = [l for l in re.split(r"[\n\r]+", raw) if l.strip()]
+        if lines:
+            reflection = lines[0]
+            encouragement = " ".join(lines[1:])
+    reflection = _sanitize_text(reflection)
+    encouragement = _sanitize_text(encouragement)
+    if not encouragement:
+        encouragement = "Take heart—God is with you today."
+    return {"reflection": reflection, "encouragement": encouragement}
 
 
-def generate_encouragement(mood: str, text: Optional[str] = None) -> Dict[str, str]:
+def generate_ai_reflection(verse_text: str, reference: Optional[str] = None) -> Dict[str, str]:
     model = _get_model()
+    if model is None:
+        return _reflection_fallback()
+    try:
+        response = model.generate_content(_reflection_prompt(verse_text, reference))
+        return _parse_reflection(_response_text(response))
+    except Exception:
+        return _reflection_fallback()
+
+
+async def agenerate_ai_reflection(verse_text: str, reference: Optional[str] = None) -> Dict[str, str]:
+    model = _get_model()
+    if model is None:
+        return _reflection_fallback()
+    try:
+        raw = await _generate_text_async(model, _reflection_prompt(verse_text, reference))
+        return _parse_reflection(raw)
+    except Exception:
+        return _reflection_fallback()
+
+
+# --- Mood encouragement -----------------------------------------------------
+
+# Simple rule-based fallback used when no model is configured
+_ENCOURAGEMENT_PRESETS: Dict[str, Dict[str, str]] = {
+    "anxious": {
+        "verse": "Philippians 4:6-7",
+        "message": "Paul reminds us not to worry but to pray with thanksgiving.",
+        "encouragement": "You are not alone; God's peace will guard your heart and mind.",
+    },
+    "tired": {
+        "verse": "Matthew 11:28",
+        "message": "Jesus invites the weary to find rest in Him.",
+        "encouragement": "Lay your burdens on Him—He gives true rest.",
+    },
+    "hopeful": {
+        "verse": "Jeremiah 29:11",
+        "message": "God has plans to give you a future and a hope.",
+        "encouragement": "Trust that His plans are unfolding for your good.",
+    },
+    "grateful": {
+        "verse": "1 Thessalonians 5:18",
+        "message": "Give thanks in all circumstances; this is God's will for you.",
+        "encouragement": "Keep praising—gratitude opens your heart to God's joy.",
+    },
+}
+
+
+_ENCOURAGEMENT_CACHE: Optional[TieredCache] = None
+
+
+def _get_encouragement_cache() -> TieredCache:
+    """Response cache for /encouragement, built on first use.
+
+    ENCOURAGEMENT_CACHE_DB adds a SQLite tier that survives restarts and is
+    shared by all workers using the same file.
+    """
+    global _ENCOURAGEMENT_CACHE
+    if _ENCOURAGEMENT_CACHE is None:
+        ttl = float(os.getenv("ENCOURAGEMENT_CACHE_TTL", "3600"))
+        size = int(os.getenv("ENCOURAGEMENT_CACHE_SIZE", "256"))
+        persistent: Optional[SQLiteCache] = None
+        db_path = os.getenv("ENCOURAGEMENT_CACHE_DB")
+        if db_path:
+            try:
+                persistent = SQLiteCache(db_path, table="encouragement_cache", max_entries=size * 16, ttl_seconds=ttl)
+            except Exception:
+                persistent = None
+        _ENCOURAGEMENT_CACHE = TieredCache(TTLCache(max_entries=size, ttl_seconds=ttl), persistent)
+    return _ENCOURAGEMENT_CACHE
+
+
+def _encouragement_cache_key(mood: Optional[str], text: Optional[str]) -> Optional[str]:
+    mood_key = " ".join((mood or "").lower().split())
+    text_key = " ".join((text or "").lower().split())
+    if text_key:
+        # Free text is personal and rarely repeats; only cache it when asked to
+        if os.getenv("ENCOURAGEMENT_CACHE_FREE_TEXT", "0").lower() not in ("1", "true", "yes"):
+            return None
+        text_key = hashlib.sha256(text_key.encode("utf-8")).hexdigest()[:32]
+    return f"enc:{mood_key}:{text_key}"
+
+
+def encouragement_cache_stats() -> Dict[str, object]:
+    return _get_encouragement_cache().stats()
+
+
+def _encouragement_prompt(mood: str, text: Optional[str]) -> str:
     mood_text = (mood or "").strip()
     user_text = (text or "").strip()
     context = {"mood": mood_text or None, "text": user_text or None}
-    prompt = (
+    return (
         f"{SYSTEM_PROMPT}\n\n"
         "Task: Create a short, practical encouragement tailored to the user's state.\n"
         "Rules:\n"
@@ -139,56 +490,163 @@ def generate_encouragement(mood: str, text: Optional[str] = None) -> Dict[str, s
         "Example JSON: {\"verse\": \"Psalm 23:1 — The Lord is my shepherd; I shall not want.\", \"message\": \"God shepherds and provides.\", \"encouragement\": \"Let Him guide your steps today.\"}"
     )
 
+
+def _encouragement_preset(mood: str) -> Dict[str, str]:
+    return dict(_ENCOURAGEMENT_PRESETS.get((mood or "").lower(), _ENCOURAGEMENT_PRESETS["hopeful"]))
+
+
+def _encouragement_error_fallback() -> Dict[str, str]:
+    return {
+        "verse": "Isaiah 41:10",
+        "message": "God strengthens and upholds those who fear not.",
+        "encouragement": _sanitize_text("Do not be afraid—He is with you and will help you."),
+    }
+
+
+def _parse_encouragement(raw: str) -> Dict[str, str]:
+    # Try parse JSON in output (allow extra text around)
+    payload = _extract_json(raw)
+    verse = _sanitize_text(str(payload.get("verse", "")))
+    message = _sanitize_text(str(payload.get("message", "")))
+    encouragement = _sanitize_text(str(payload.get("encouragement", "")))
+    return {"verse": verse, "message": message, "encouragement": encouragement}
+
+
+def generate_encouragement(mood: str, text: Optional[str] = None) -> Dict[str, str]:
+    model = _get_model()
+    if model is None:
+        return _encouragement_preset(mood)
+    try:
+        response = model.generate_content(_encouragement_prompt(mood, text))
+        return _parse_encouragement(_response_text(response))
+    except Exception:
+        return _encouragement_error_fallback()
+
+
+async def agenerate_encouragement(mood: str, text: Optional[str] = None) -> Dict[str, str]:
+    model = _get_model()
     if model is None:
-        # Simple rule-based fallback
-        presets = {
-            "anxious": {
-                "verse": "Philippians 4:6-7",
-                "message": "Paul reminds us not to worry but to pray with thanksgiving.",
-                "encouragement": "You are not alone; God's peace will guard your heart and mind.",
-            },
-            "tired": {
-                "verse": "Matthew 11:28",
-                "message": "Jesus invites the weary to find rest in Him.",
-                "encouragement": "Lay your burdens on Him—He gives true rest.",
-            },
-            "hopeful": {
-                "verse": "Jeremiah 29:11",
-                "message": "God has plans to give you a future and a hope.",
-                "encouragement": "Trust that His plans are unfolding for your good.",
-            },
-            "grateful": {
-                "verse": "1 Thessalonians 5:18",
-                "message": "Give thanks in all circumstances; this is God's will for you.",
-                "encouragement": "Keep praising—gratitude opens your heart to God's joy.",
-            },
-        }
-        return presets.get(mood.lower(), presets["hopeful"])  # default
-        # print('heyyyyyyyyyyyyyyyyyyyyyyyyyy')
+        return _encouragement_preset(mood)
+    key = _encouragement_cache_key(mood, text)
+    cache = _get_encouragement_cache()
+    if key is not None:
+        cached = await cache.aget(key)
+        if cached is not None:
+            return dict(cached)
+    try:
+        raw = await _generate_text_async(model, _encouragement_prompt(mood, text))
+        res = _parse_encouragement(raw)
+    except Exception:
+        return _encouragement_error_fallback()
+    # Only successful model output is cached; fallbacks are retried next time
+    if key is not None and res.get("verse"):
+        await cache.aset(key, res)
+    return res
+
+
+# --- Journal Q&A ------------------------------------------------------------
+
+# Answers keyed on the asking user, the normalized question and a hash of the
+# exact context sent to the model, so an edit that changes the context misses
+# by construction. Memory only: answers quote private journals.
+_ANSWER_CACHE: Optional[TTLCache] = None
+# Per-user generation, bumped by invalidate_answer_cache. Same size and TTL as
+# the answers, so a generation outlives every answer stored before the bump;
+# tokens are never reused, so a lapsed generation can't revive old answers.
+_ANSWER_GEN: Optional[TTLCache] = None
+_ANSWER_GEN_TOKENS = itertools.count(1)
+_ANSWER_METRICS = {"model_seconds": 0.0, "saved_seconds": 0.0}
+_QUESTION_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def _get_answer_cache() -> TTLCache:
+    global _ANSWER_CACHE, _ANSWER_GEN
+    if _ANSWER_CACHE is None:
+        size = int(os.getenv("ANSWER_CACHE_SIZE", "2048"))
+        ttl = float(os.getenv("ANSWER_CACHE_TTL", "86400"))
+        _ANSWER_CACHE = TTLCache(max_entries=size, ttl_seconds=ttl)
+        _ANSWER_GEN = TTLCache(max_entries=size, ttl_seconds=ttl)
+    return _ANSWER_CACHE
+
+
+def _get_answer_gen() -> TTLCache:
+    _get_answer_cache()
+    return _ANSWER_GEN
+
+
+def _answer_cache_key(kind: str, scope: Optional[str], question: str, context: str) -> Optional[str]:
+    if scope is None or os.getenv("ANSWER_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    q = " ".join(_QUESTION_PUNCT_RE.sub(" ", question.casefold()).split())
+    digest = hashlib.sha256(f"{q}\0{context}".encode("utf-8")).hexdigest()[:40]
+    return f"{kind}:{scope}:{_get_answer_gen().get(scope) or 0}:{digest}"
+
+
+def _cached_answer(key: Optional[str]) -> Optional[str]:
+    if key is None:
+        return None
+    hit = _get_answer_cache().get(key)
+    if hit is None:
+        return None
+    answer, latency = hit
+    _ANSWER_METRICS["saved_seconds"] += latency
+    return answer
+
+
+def _store_answer(key: Optional[str], answer: str, started: float) -> None:
+    latency = time.perf_counter() - started
+    _ANSWER_METRICS["model_seconds"] += latency
+    if key is not None and answer:
+        _get_answer_cache().set(key, (answer, latency))
+
+
+def invalidate_answer_cache(scope: str) -> None:
+    """Drop every cached answer for ``scope`` (the user id), e.g. after a delete."""
+    _get_answer_gen().set(scope, next(_ANSWER_GEN_TOKENS))
 
+
+def answer_cache_stats() -> Dict[str, object]:
+    out = _get_answer_cache().stats()
+    out.update({k: round(v, 3) for k, v in _ANSWER_METRICS.items()})
+    return out
+
+
+async def _cached_generate(
+    key: Optional[str], prompt: str, sanitize: Callable[[str], str], no_model_text: str, error_text: str
+) -> str:
+    model = _get_model()
+    if model is None:
+        return _sanitize_text(no_model_text)
+    cached = _cached_answer(key)
+    if cached is not None:
+        return cached
+    started = time.perf_counter()
     try:
-        response = model.generate_content(prompt)
-        raw = response.text.strip() if hasattr(response, "text") else ""
-        # Try parse JSON in output (allow extra text around)
-        import json
-        start = raw.find("{")
-        end = raw.rfind("}")
-        payload = json.loads(raw[start : end + 1]) if start != -1 and end != -1 else json.loads(raw)
-        verse = _sanitize_text(str(payload.get("verse", "")))
-        message = _sanitize_text(str(payload.get("message", "")))
-        encouragement = _sanitize_text(str(payload.get("encouragement", "")))
-        return {"verse": verse, "message": message, "encouragement": encouragement}
+        answer = sanitize(await _generate_text_async(model, prompt))
     except Exception:
-        
-        return {
-            "verse": "Isaiah 41:10",
-            "message": "God strengthens and upholds those who fear not.",
-            "encouragement": _sanitize_text("Do not be afraid—He is with you and will help you."),
-        }
+        return sanitize(error_text)
+    # Only real model output is cached; fallbacks are retried next time
+    _store_answer(key, answer, started)
+    return answer
 
 
-def generate_journal_answer(question: str, entries_text: str) -> str:
+async def _cached_stream(
+    key: Optional[str], prompt: str, sanitize: Callable[[str], str], no_model_text: str, error_text: str
+) -> AsyncIterator[Dict[str, str]]:
     model = _get_model()
+    cached = _cached_answer(key) if model is not None else None
+    if cached is not None:
+        yield {"delta": cached}
+        yield {"answer": cached}
+        return
+    started = time.perf_counter()
+    async for event in _stream_sanitized(
+        model, prompt, sanitize, no_model_text, error_text, on_success=lambda a: _store_answer(key, a, started)
+    ):
+        yield event
+
+
+def _journal_answer_prompt(question: str, entries_text: str) -> str:
     base_prompt = (
         f"{SYSTEM_PROMPT}\n\n"
         "Task: Answer the user's question grounded in the Bible and the user's journal excerpts.\n"
@@ -196,29 +654,53 @@ def generate_journal_answer(question: str, entries_text: str) -> str:
         "- Include at least one Bible reference with a concise paraphrase.\n"
         "- Do NOT use markdown or special formatting; return clean plain text.\n"
     )
-    prompt = base_prompt + f"\nJournal excerpts (may be partial):\n{entries_text}\n\nQuestion: {question}"
+    # Callers budget the context; this cap only guards against ones that don't
+    entries_text = truncate_to_tokens(entries_text, ASK_CONTEXT_TOKENS)
+    return base_prompt + f"\nJournal excerpts (may be partial):\n{entries_text}\n\nQuestion: {question}"
+
+
+_JOURNAL_ANSWER_NO_MODEL = "God cares for what you shared. Consider Philippians 4:6-7—bring your concerns to Him in prayer, trusting His peace to guard your heart and mind."
+_JOURNAL_ANSWER_ERROR = "Seek the Lord in prayer and Scripture today; Psalm 34:17-18 reminds us that He is near to the brokenhearted and saves those crushed in spirit."
 
-    if model is None:
-        return _sanitize_text("God cares for what you shared. Consider Philippians 4:6-7—bring your concerns to Him in prayer, trusting His peace to guard your heart and mind.")
 
+def generate_journal_answer(question: str, entries_text: str) -> str:
+    model = _get_model()
+    if model is None:
+        return _sanitize_text(_JOURNAL_ANSWER_NO_MODEL)
     try:
-        resp = model.generate_content(prompt)
-        raw = resp.text.strip() if hasattr(resp, "text") else ""
-        return _sanitize_text(raw)
+        resp = model.generate_content(_journal_answer_prompt(question, entries_text))
+        return _sanitize_text(_response_text(resp))
     except Exception:
-        return _sanitize_text("Seek the Lord in prayer and Scripture today; Psalm 34:17-18 reminds us that He is near to the brokenhearted and saves those crushed in spirit.")
+        return _sanitize_text(_JOURNAL_ANSWER_ERROR)
 
 
-def generate_entry_answer(question: str, entry_text: str) -> str:
-    """Answer a question based on a single journal entry.
+async def agenerate_journal_answer(question: str, entries_text: str, cache_scope: Optional[str] = None) -> str:
+    """Async :func:`generate_journal_answer`; ``cache_scope`` (the user id) enables the answer cache."""
+    return await _cached_generate(
+        _answer_cache_key("journal", cache_scope, question, entries_text),
+        _journal_answer_prompt(question, entries_text),
+        _sanitize_text,
+        _JOURNAL_ANSWER_NO_MODEL,
+        _JOURNAL_ANSWER_ERROR,
+    )
 
-    Output format (exactly three lines):
-    Book Chapter:Verse — <full Bible text>
-    Reflection: <reflection text>
-    Encouragement: <encouragement text>
-    """
-    model = _get_model()
-    prompt = (
+
+def astream_journal_answer(
+    question: str, entries_text: str, cache_scope: Optional[str] = None
+) -> AsyncIterator[Dict[str, str]]:
+    """Streaming variant of :func:`generate_journal_answer`."""
+    return _cached_stream(
+        _answer_cache_key("journal", cache_scope, question, entries_text),
+        _journal_answer_prompt(question, entries_text),
+        _sanitize_text,
+        _JOURNAL_ANSWER_NO_MODEL,
+        _JOURNAL_ANSWER_ERROR,
+    )
+
+
+def _entry_answer_prompt(question: str, entry_text: str) -> str:
+    entry_text = truncate_to_tokens(entry_text, ASK_CONTEXT_TOKENS)
+    return (
         f"{SYSTEM_PROMPT}\n\n"
         "Task: Using the user's single journal entry as context, answer their question strictly in this 3-line format:\n"
         "1) Book Chapter:Verse — <full Bible text>\n"
@@ -228,22 +710,104 @@ def generate_entry_answer(question: str, entry_text: str) -> str:
         "- Choose a fitting verse and include the full verse text on line 1.\n\n"
         f"Journal Entry:\n{entry_text}\n\nQuestion: {question}"
     )
+
+
+_ENTRY_ANSWER_NO_MODEL = (
+    "John 14:27 — Peace I leave with you; my peace I give you.\n"
+    "Reflection: God offers real peace even amid anxious thoughts; bring them to Him.\n"
+    "Encouragement: Take courage—Christ’s peace can steady your heart today."
+)
+_ENTRY_ANSWER_ERROR = (
+    "Philippians 4:6–7 — Do not be anxious about anything… and the peace of God… will guard your hearts.\n"
+    "Reflection: God invites you to pray honestly and receive His guarding peace.\n"
+    "Encouragement: Hand today’s burden to Him—He is near and faithful."
+)
+
+
+def generate_entry_answer(question: str, entry_text: str) -> str:
+    """Answer a question based on a single journal entry.
+
+    Output format (exactly three lines):
+    Book Chapter:Verse — <full Bible text>
+    Reflection: <reflection text>
+    Encouragement: <encouragement text>
+    """
+    model = _get_model()
     if model is None:
-        return _sanitize_text(
-            "John 14:27 — Peace I leave with you; my peace I give you.\n"
-            "Reflection: God offers real peace even amid anxious thoughts; bring them to Him.\n"
-            "Encouragement: Take courage—Christ’s peace can steady your heart today."
-        )
+        return _sanitize_text(_ENTRY_ANSWER_NO_MODEL)
     try:
-        resp = model.generate_content(prompt)
-        raw = resp.text.strip() if hasattr(resp, "text") else ""
-        return _sanitize_keep_newlines_and_labels(raw)
+        resp = model.generate_content(_entry_answer_prompt(question, entry_text))
+        return _sanitize_keep_newlines_and_labels(_response_text(resp))
     except Exception:
-        return _sanitize_keep_newlines_and_labels(
-            "Philippians 4:6–7 — Do not be anxious about anything… and the peace of God… will guard your hearts.\n"
-            "Reflection: God invites you to pray honestly and receive His guarding peace.\n"
-            "Encouragement: Hand today’s burden to Him—He is near and faithful."
-        )
+        return _sanitize_keep_newlines_and_labels(_ENTRY_ANSWER_ERROR)
+
+
+async def agenerate_entry_answer(question: str, entry_text: str, cache_scope: Optional[str] = None) -> str:
+    """Async variant of :func:`generate_entry_answer` (same three-line format)."""
+    return await _cached_generate(
+        _answer_cache_key("entry", cache_scope, question, entry_text),
+        _entry_answer_prompt(question, entry_text),
+        _sanitize_keep_newlines_and_labels,
+        _ENTRY_ANSWER_NO_MODEL,
+        _ENTRY_ANSWER_ERROR,
+    )
+
+
+def astream_entry_answer(
+    question: str, entry_text: str, cache_scope: Optional[str] = None
+) -> AsyncIterator[Dict[str, str]]:
+    """Streaming variant of :func:`generate_entry_answer`."""
+    model = _get_model()
+    if model is None:
+        # Match generate_entry_answer, which flattens the no-model text
+        return _stream_sanitized(None, "", _sanitize_text, _ENTRY_ANSWER_NO_MODEL, "")
+    return _cached_stream(
+        _answer_cache_key("entry", cache_scope, question, entry_text),
+        _entry_answer_prompt(question, entry_text),
+        _sanitize_keep_newlines_and_labels,
+        _ENTRY_ANSWER_NO_MODEL,
+        _ENTRY_ANSWER_ERROR,
+    )
+
+
+# --- Entry summaries ------------------------------------------------------------
+
+ENTRY_SUMMARY_MIN_CHARS = int(os.getenv("ENTRY_SUMMARY_MIN_CHARS", "800"))
+ENTRY_SUMMARY_MAX_CHARS = int(os.getenv("ENTRY_SUMMARY_MAX_CHARS", "400"))
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _summary_prompt(text: str) -> str:
+    return (
+        "Summarize this private journal entry in at most 3 short sentences (under 60 words) for later "
+        "retrieval. Keep names, events, feelings and prayer requests. Plain text only, no preamble.\n\n"
+        f"Entry:\n{truncate_to_tokens(text, ASK_CONTEXT_TOKENS)}"
+    )
+
+
+def _extractive_summary(text: str) -> str:
+    """Leading sentences up to ENTRY_SUMMARY_MAX_CHARS, used without a model."""
+    out = ""
+    for sentence in _SENTENCE_END_RE.split(" ".join(text.split())):
+        if out and len(out) + len(sentence) + 1 > ENTRY_SUMMARY_MAX_CHARS:
+            break
+        out = f"{out} {sentence}".strip()
+    return truncate_to_tokens(out, ENTRY_SUMMARY_MAX_CHARS // 4)
+
+
+async def agenerate_entry_summary(text: str) -> Optional[str]:
+    """Short summary for prompt budgeting, or None when the entry is short
+    enough to be its own summary."""
+    if len(text or "") < ENTRY_SUMMARY_MIN_CHARS:
+        return None
+    model = _get_model()
+    if model is None:
+        return _extractive_summary(text)
+    try:
+        raw = _sanitize_text(await _generate_text_async(model, _summary_prompt(text)))
+        return truncate_to_tokens(raw, ENTRY_SUMMARY_MAX_CHARS // 4) or _extractive_summary(text)
+    except Exception:
+        return _extractive_summary(text)
 
 
 def generate_mass_reflection(readings_text: str) -> Dict[str, str]:
@@ -0,0 +1,74 @@
+"""Keyed term hashes for searching encrypted journal entries.
+
+Each word of an entry is stored only as ``HMAC(user_key, word)``, where the
+per-user key is itself an HMAC of JOURNAL_INDEX_KEY (falling back to
+JOURNAL_KEY, then JWT_SECRET). The database can match a query against an
+entry without learning the words, and equal words in two users' journals
+hash differently. Changing the index key invalidates every stored hash;
+rebuild with ``POST /journal/reindex``.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_HASH_BYTES = 12
+_MAX_TERM_CHARS = 64
+
+# Too common to be worth an index row
+_STOPWORDS = frozenset(
+    """a an and are as at be but by for from had has have he her him his i if in into is it its
+    me my of on or our she so that the their them then there they this to was we were what when
+    which who will with you your""".split()
+)
+
+_MASTER_KEY: Optional[bytes] = None
+
+
+def _master_key() -> bytes:
+    global _MASTER_KEY
+    if _MASTER_KEY is None:
+        secret = (
+            os.getenv("JOURNAL_INDEX_KEY")
+            or os.getenv("JOURNAL_KEY")
+            or os.getenv("JOURNAL_ENC_KEY")
+            or os.getenv("JWT_SECRET", "dev-secret-change")
+        )
+        _MASTER_KEY = hashlib.sha256(b"soulspark-blind-index:" + secret.encode("utf-8")).digest()
+    return _MASTER_KEY
+
+
+def _user_key(user_id: int) -> bytes:
+    return hmac.new(_master_key(), f"user:{user_id}".encode("ascii"), hashlib.sha256).digest()
+
+
+def _hash(key: bytes, term: str) -> str:
+    digest = hmac.new(key, term.encode("utf-8"), hashlib.sha256).digest()[:_HASH_BYTES]
+    return base64.urlsafe_b64encode(digest).decode("ascii")
+
+
+def tokenize(text: str) -> List[str]:
+    """Casefolded words, minus stopwords and one-letter tokens."""
+    return [
+        w[:_MAX_TERM_CHARS]
+        for w in _WORD_RE.findall((text or "").casefold())
+        if len(w) > 1 and w not in _STOPWORDS
+    ]
+
+
+def term_hashes(user_id: int, text: str) -> Dict[str, int]:
+    """Blind term -> occurrence count for one entry."""
+    key = _user_key(user_id)
+    return {_hash(key, term): n for term, n in Counter(tokenize(text)).items()}
+
+
+def query_hashes(user_id: int, query: str) -> List[str]:
+    """Distinct blind terms for a search query, in query order."""
+    key = _user_key(user_id)
+    return [_hash(key, term) for term in dict.fromkeys(tokenize(query))]
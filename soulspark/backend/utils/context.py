@@ -0,0 +1,69 @@
+"""Fit journal text into a prompt token budget.
+
+Token counts are estimated at ~4 characters per token, which is close for
+English prose with Gemini's tokenizer and needs no network round trip.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+ASK_CONTEXT_TOKENS = int(os.getenv("ASK_CONTEXT_TOKENS", "3000"))
+
+_CHARS_PER_TOKEN = 4
+# Below this, a truncated tail is more noise than context
+_MIN_TRUNCATED_TOKENS = 32
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text or "") // _CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to about ``max_tokens``, preferring a word boundary."""
+    max_chars = max(0, max_tokens) * _CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max(0, max_chars - 1)]
+    space = cut.rfind(" ")
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+@dataclass
+class ContextItem:
+    header: str
+    text: str
+    summary: Optional[str] = None
+
+
+def build_context(items: Sequence[ContextItem], budget_tokens: int = ASK_CONTEXT_TOKENS, sep: str = "\n---\n") -> str:
+    """Join ``items`` (most relevant first) within ``budget_tokens``.
+
+    First every item gets its compact form (the summary when it is shorter
+    than the text) in order until the budget runs out, the last one truncated
+    to fit. Leftover budget then upgrades items back to full text, again in
+    order of relevance.
+    """
+    chosen: List[List[object]] = []  # [item, body]
+    used = 0
+    for item in items:
+        compact = item.summary if item.summary and len(item.summary) < len(item.text) else item.text
+        cost = estimate_tokens(item.header) + estimate_tokens(sep) + estimate_tokens(compact)
+        if used + cost > budget_tokens:
+            room = budget_tokens - used - estimate_tokens(item.header) - estimate_tokens(sep)
+            if room >= _MIN_TRUNCATED_TOKENS:
+                chosen.append([item, truncate_to_tokens(compact, room)])
+            break
+        chosen.append([item, compact])
+        used += cost
+    else:
+        for entry in chosen:
+            item, body = entry
+            extra = estimate_tokens(item.text) - estimate_tokens(body)
+            if item.text != body and used + extra <= budget_tokens:
+                entry[1] = item.text
+                used += extra
+    return sep.join(f"{item.header} {body}".strip() for item, body in chosen)
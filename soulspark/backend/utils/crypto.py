@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import os
-from typing import Optional
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 try:
     from cryptography.fernet import Fernet  # type: ignore
@@ -15,10 +19,18 @@ except Exception:  # pragma: no cover - optional in dev
     PBKDF2HMAC = None  # type: ignore
     hashes = None  # type: ignore
 
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
 
 _FERNET: Optional["Fernet"] = None
-_AESGCM: Optional["AESGCM"] = None
-_KDF_DONE: bool = False
+_FERNET_LOADED: bool = False
+
+# Key id used for JOURNAL_KEY, which also decrypts legacy enc1 tokens
+LEGACY_KEY_ID = "0"
+_KID_CHARS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-")
 
 
 def _derive_key_from_passphrase(passphrase: str, salt: bytes) -> Optional[bytes]:
@@ -28,54 +40,123 @@ def _derive_key_from_passphrase(passphrase: str, salt: bytes) -> Optional[bytes]
     return kdf.derive(passphrase.encode("utf-8"))
 
 
-def _load_aesgcm() -> Optional["AESGCM"]:
-    global _AESGCM, _KDF_DONE
-    if _AESGCM is not None:
-        return _AESGCM
-    if AESGCM is None:
-        return None
-
-    # Preferred configuration: JOURNAL_KEY (base64 or passphrase) + JOURNAL_SALT
-    key_env = os.getenv("JOURNAL_KEY") or os.getenv("JOURNAL_ENC_KEY")
+def _key_bytes_from_secret(secret: str) -> Optional[bytes]:
+    """Accept a urlsafe-base64 32-byte key, else derive one from a passphrase."""
+    try:
+        key_bytes = base64.urlsafe_b64decode(secret)
+        if len(key_bytes) == 32:
+            return key_bytes
+    except Exception:
+        pass
     salt_env = os.getenv("JOURNAL_SALT")
-    key_bytes: Optional[bytes] = None
-
-    if key_env:
-        # Try base64 first
+    if salt_env:
         try:
-            key_bytes = base64.urlsafe_b64decode(key_env)
-            if len(key_bytes) != 32:
-                key_bytes = None
+            salt = base64.urlsafe_b64decode(salt_env)
         except Exception:
-            key_bytes = None
-        if key_bytes is None:
-            # Derive from passphrase if salt is provided
-            if salt_env:
-                try:
-                    salt = base64.urlsafe_b64decode(salt_env)
-                except Exception:
-                    salt = salt_env.encode("utf-8")
-            else:
-                # Fallback salt from JWT_SECRET to avoid accidental no-encryption
-                fallback = os.getenv("JWT_SECRET", "manna-default-salt")
-                salt = fallback.encode("utf-8")
-            key_bytes = _derive_key_from_passphrase(key_env, salt)
-            _KDF_DONE = True
+            salt = salt_env.encode("utf-8")
+    else:
+        # Fallback salt from JWT_SECRET to avoid accidental no-encryption
+        fallback = os.getenv("JWT_SECRET", "manna-default-salt")
+        salt = fallback.encode("utf-8")
+    return _derive_key_from_passphrase(secret, salt)
 
-    if key_bytes is None:
-        return None
 
-    try:
-        _AESGCM = AESGCM(key_bytes)
-    except Exception:
-        _AESGCM = None
-    return _AESGCM
+class KeyManager:
+    """Versioned AES-GCM keys, each derived once per process.
+
+    Keys come from JOURNAL_KEY (id ``"0"``, also used for legacy ``enc1``
+    tokens) and JOURNAL_KEYS, a comma-separated ``kid:secret`` list. New
+    tokens use JOURNAL_ACTIVE_KEY_ID, defaulting to the last JOURNAL_KEYS entry
+    or ``"0"``. Failed derivations are cached as ``None`` so a bad config
+    costs one KDF run, not one per request.
+    """
+
+    def __init__(self) -> None:
+        self._keys: Dict[str, Optional["AESGCM"]] = {}
+        self._active: Optional[str] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _configured() -> Tuple[Dict[str, str], Optional[str]]:
+        secrets: Dict[str, str] = {}
+        legacy = os.getenv("JOURNAL_KEY") or os.getenv("JOURNAL_ENC_KEY")
+        if legacy:
+            secrets[LEGACY_KEY_ID] = legacy
+        last: Optional[str] = None
+        for item in (os.getenv("JOURNAL_KEYS") or "").split(","):
+            kid, sep, secret = item.strip().partition(":")
+            if sep and secret and kid and set(kid) <= _KID_CHARS:
+                secrets[kid] = secret
+                last = kid
+        active = os.getenv("JOURNAL_ACTIVE_KEY_ID") or last or (LEGACY_KEY_ID if legacy else None)
+        return secrets, active
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            secrets, active = self._configured()
+            keys: Dict[str, Optional["AESGCM"]] = {}
+            for kid, secret in secrets.items():
+                aes: Optional["AESGCM"] = None
+                if AESGCM is not None:
+                    try:
+                        key_bytes = _key_bytes_from_secret(secret)
+                        aes = AESGCM(key_bytes) if key_bytes is not None else None
+                    except Exception:
+                        aes = None
+                keys[kid] = aes
+            self._keys = keys
+            self._active = active if active in keys else None
+            self._loaded = True
+
+    def get(self, kid: str) -> Optional["AESGCM"]:
+        self.load()
+        return self._keys.get(kid)
+
+    def active(self) -> Tuple[Optional[str], Optional["AESGCM"]]:
+        self.load()
+        if self._active is None:
+            return None, None
+        return self._active, self._keys.get(self._active)
+
+    def key_ids(self) -> List[str]:
+        self.load()
+        return [kid for kid, aes in self._keys.items() if aes is not None]
+
+    def prewarm(self) -> threading.Thread:
+        """Derive keys on a background thread so no request pays the KDF."""
+        t = threading.Thread(target=self.load, name="journal-key-prewarm", daemon=True)
+        t.start()
+        return t
+
+    def reset(self) -> None:
+        with self._lock:
+            self._keys = {}
+            self._active = None
+            self._loaded = False
+
+
+KEYS = KeyManager()
+
+
+def prewarm_keys() -> None:
+    KEYS.prewarm()
+
+
+def _load_aesgcm() -> Optional["AESGCM"]:
+    """Active AES-GCM key (derived once, including failures)."""
+    return KEYS.active()[1]
 
 
 def _load_fernet() -> Optional["Fernet"]:
-    global _FERNET
-    if _FERNET is not None:
+    global _FERNET, _FERNET_LOADED
+    if _FERNET_LOADED:
         return _FERNET
+    _FERNET_LOADED = True
     if Fernet is None:
         return None
 
@@ -98,20 +179,122 @@ def _load_fernet() -> Optional["Fernet"]:
     return _FERNET
 
 
+def _b64decode(raw: str) -> bytes:
+    return base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4))
+
+
+# --- Compression ----------------------------------------------------------------
+# enc3 tokens seal ``codec byte [+ 4-byte dictionary id] + payload`` instead of
+# the raw UTF-8 text. The codec byte is 1 for zlib and 2 for zstd; its high bit
+# marks a shared dictionary, identified by the CRC32 of its bytes so a token is
+# never opened with the wrong one.
+
+_CODEC_ZLIB = 1
+_CODEC_ZSTD = 2
+_DICT_FLAG = 0x80
+
+
+class _Compressor:
+    """Codec, level, size threshold and optional dictionary from env."""
+
+    def __init__(self) -> None:
+        codec = (os.getenv("JOURNAL_COMPRESS") or "zlib").lower()
+        if codec == "zstd" and zstandard is None:
+            codec = "zlib"
+        self.codec = {"zlib": _CODEC_ZLIB, "zstd": _CODEC_ZSTD}.get(codec)
+        self.min_bytes = int(os.getenv("JOURNAL_COMPRESS_MIN_BYTES", "256"))
+        default_level = "3" if self.codec == _CODEC_ZSTD else "6"
+        self.level = int(os.getenv("JOURNAL_COMPRESS_LEVEL", default_level))
+        self.dict_bytes: Optional[bytes] = None
+        self.dict_id = b""
+        path = os.getenv("JOURNAL_COMPRESS_DICT")
+        if path:
+            try:
+                with open(path, "rb") as fh:
+                    self.dict_bytes = fh.read() or None
+            except OSError:
+                self.dict_bytes = None
+        if self.dict_bytes:
+            self.dict_id = zlib.crc32(self.dict_bytes).to_bytes(4, "big")
+        self._zstd_dict = None
+        self._local = threading.local()
+
+    def _zstd_dictionary(self):
+        if self._zstd_dict is None and self.dict_bytes:
+            self._zstd_dict = zstandard.ZstdCompressionDict(self.dict_bytes)
+        return self._zstd_dict
+
+    def _zstd(self, kind: str):
+        # zstd (de)compressor objects are not thread-safe; keep one per thread
+        obj = getattr(self._local, kind, None)
+        if obj is None:
+            d = self._zstd_dictionary()
+            if kind == "c":
+                obj = zstandard.ZstdCompressor(level=self.level, dict_data=d)
+            else:
+                obj = zstandard.ZstdDecompressor(dict_data=d)
+            setattr(self._local, kind, obj)
+        return obj
+
+    def compress(self, data: bytes) -> Optional[bytes]:
+        """Framed payload, or None when the text is too small or doesn't shrink."""
+        if self.codec is None or len(data) < self.min_bytes:
+            return None
+        if self.codec == _CODEC_ZSTD:
+            body = self._zstd("c").compress(data)
+        elif self.dict_bytes:
+            c = zlib.compressobj(self.level, zdict=self.dict_bytes)
+            body = c.compress(data) + c.flush()
+        else:
+            body = zlib.compress(data, self.level)
+        header = bytes([self.codec | (_DICT_FLAG if self.dict_bytes else 0)]) + self.dict_id
+        framed = header + body
+        return framed if len(framed) < len(data) else None
+
+    def decompress(self, framed: bytes) -> bytes:
+        codec, body = framed[0], framed[1:]
+        zdict = None
+        if codec & _DICT_FLAG:
+            if body[:4] != self.dict_id:
+                raise ValueError("compression dictionary mismatch")
+            body, zdict = body[4:], self.dict_bytes
+            codec &= ~_DICT_FLAG
+        if codec == _CODEC_ZLIB:
+            d = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+            return d.decompress(body) + d.flush()
+        if codec == _CODEC_ZSTD and zstandard is not None:
+            if zdict is None:
+                return zstandard.ZstdDecompressor().decompress(body)
+            return self._zstd("d").decompress(body)
+        raise ValueError(f"unknown codec {codec}")
+
+
+_COMPRESSOR: Optional[_Compressor] = None
+
+
+def _get_compressor() -> _Compressor:
+    global _COMPRESSOR
+    if _COMPRESSOR is None:
+        _COMPRESSOR = _Compressor()
+    return _COMPRESSOR
+
+
 def encrypt_text(plaintext: str) -> str:
     if plaintext is None or plaintext == "":
         return ""
 
-    # Prefer AES-GCM with random nonce; token format: enc1:<base64(nonce|ciphertext)>
-    aes = _load_aesgcm()
+    # Prefer AES-GCM with random nonce; token format: enc2:<kid>:<base64(nonce|ciphertext)>,
+    # or enc3:<kid>:... when the text is large enough to be compressed first
+    kid, aes = KEYS.active()
     if aes is not None:
         try:
-            import os as _os
-
-            nonce = _os.urandom(12)
-            ct = aes.encrypt(nonce, plaintext.encode("utf-8"), associated_data=None)
+            data = plaintext.encode("utf-8")
+            framed = _get_compressor().compress(data)
+            version = "enc2" if framed is None else "enc3"
+            nonce = os.urandom(12)
+            ct = aes.encrypt(nonce, data if framed is None else framed, associated_data=f"{version}:{kid}".encode("ascii"))
             token = base64.urlsafe_b64encode(nonce + ct).decode("utf-8").rstrip("=")
-            return f"enc1:{token}"
+            return f"{version}:{kid}:{token}"
         except Exception:
             pass
 
@@ -131,14 +314,30 @@ def decrypt_text(ciphertext: str) -> str:
     if ciphertext is None or ciphertext == "":
         return ""
 
-    # AES-GCM token
+    # Versioned AES-GCM token: the key id picks the key directly; enc3 wraps
+    # a compressed payload
+    if ciphertext.startswith(("enc2:", "enc3:")):
+        version = ciphertext[:4]
+        kid, sep, raw = ciphertext[5:].partition(":")
+        aes = KEYS.get(kid) if sep else None
+        if aes is not None:
+            try:
+                blob = _b64decode(raw)
+                nonce, ct = blob[:12], blob[12:]
+                pt = aes.decrypt(nonce, ct, associated_data=f"{version}:{kid}".encode("ascii"))
+                if version == "enc3":
+                    pt = _get_compressor().decompress(pt)
+                return pt.decode("utf-8")
+            except Exception:
+                return ciphertext
+        return ciphertext
+
+    # Legacy AES-GCM token (JOURNAL_KEY, no key id)
     if ciphertext.startswith("enc1:"):
-        aes = _load_aesgcm()
+        aes = KEYS.get(LEGACY_KEY_ID)
         if aes is not None:
             try:
-                raw = ciphertext.split(":", 1)[1]
-                padded = raw + "=" * (-len(raw) % 4)
-                blob = base64.urlsafe_b64decode(padded)
+                blob = _b64decode(ciphertext.split(":", 1)[1])
                 nonce, ct = blob[:12], blob[12:]
                 pt = aes.decrypt(nonce, ct, associated_data=None)
                 return pt.decode("utf-8")
@@ -160,6 +359,15 @@ def decrypt_text(ciphertext: str) -> str:
     return ciphertext
 
 
+def token_key_id(value: str) -> Optional[str]:
+    """Key id a token was written with (``"0"`` for enc1), or None if not AES-GCM."""
+    if value.startswith(("enc2:", "enc3:")):
+        return value[5:].partition(":")[0]
+    if value.startswith("enc1:"):
+        return LEGACY_KEY_ID
+    return None
+
+
 def has_encryption() -> bool:
     return _load_aesgcm() is not None or _load_fernet() is not None
 
@@ -167,6 +375,75 @@ def has_encryption() -> bool:
 def is_probably_encrypted(value: str) -> bool:
     if not value or len(value) < 8:
         return False
-    if value.startswith("enc1:") or value.startswith("gAAAA"):
+    if value.startswith(("enc1:", "enc2:", "enc3:", "gAAAA")):
         return True
     return False
+
+
+# --- Batch API ----------------------------------------------------------------
+# cryptography releases the GIL during AES-GCM/Fernet work, so large batches
+# are split into chunks and spread over a small thread pool. Small batches run
+# inline where pool overhead would dominate.
+
+CRYPTO_WORKERS = int(os.getenv("CRYPTO_WORKERS", str(min(8, os.cpu_count() or 1))))
+_PARALLEL_THRESHOLD = 64
+_CRYPTO_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _get_crypto_executor() -> ThreadPoolExecutor:
+    global _CRYPTO_EXECUTOR
+    if _CRYPTO_EXECUTOR is None:
+        _CRYPTO_EXECUTOR = ThreadPoolExecutor(max_workers=CRYPTO_WORKERS, thread_name_prefix="crypto")
+    return _CRYPTO_EXECUTOR
+
+
+def _chunks(values: Sequence[str]) -> List[Sequence[str]]:
+    size = max(_PARALLEL_THRESHOLD // 2, -(-len(values) // CRYPTO_WORKERS))
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+def _run_many(fn: Callable[[str], str], values: Sequence[str]) -> List[str]:
+    # Load keys once up front so worker threads never race on the KDF
+    _load_aesgcm()
+    _load_fernet()
+    _get_compressor()
+    if len(values) < _PARALLEL_THRESHOLD or CRYPTO_WORKERS <= 1:
+        return [fn(v) for v in values]
+    out: List[str] = []
+    for part in _get_crypto_executor().map(lambda chunk: [fn(v) for v in chunk], _chunks(values)):
+        out.extend(part)
+    return out
+
+
+async def _arun_many(fn: Callable[[str], str], values: Sequence[str]) -> List[str]:
+    _load_aesgcm()
+    _load_fernet()
+    _get_compressor()
+    if len(values) < _PARALLEL_THRESHOLD or CRYPTO_WORKERS <= 1:
+        return [fn(v) for v in values]
+    loop = asyncio.get_running_loop()
+    executor = _get_crypto_executor()
+    parts = await asyncio.gather(
+        *[loop.run_in_executor(executor, lambda chunk=chunk: [fn(v) for v in chunk]) for chunk in _chunks(values)]
+    )
+    return [v for part in parts for v in part]
+
+
+def decrypt_many(tokens: Sequence[str]) -> List[str]:
+    """Decrypt a batch; each item behaves exactly like :func:`decrypt_text`."""
+    return _run_many(decrypt_text, tokens)
+
+
+def encrypt_many(plaintexts: Sequence[str]) -> List[str]:
+    """Encrypt a batch; each item behaves exactly like :func:`encrypt_text`."""
+    return _run_many(encrypt_text, plaintexts)
+
+
+async def adecrypt_many(tokens: Sequence[str]) -> List[str]:
+    """Like :func:`decrypt_many`, but awaits the pool instead of blocking the loop."""
+    return await _arun_many(decrypt_text, tokens)
+
+
+async def aencrypt_many(plaintexts: Sequence[str]) -> List[str]:
+    """Like :func:`encrypt_many`, but awaits the pool instead of blocking the loop."""
+    return await _arun_many(encrypt_text, plaintexts)
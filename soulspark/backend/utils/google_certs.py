@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    from google.auth.transport import requests as grequests  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    grequests = None  # type: ignore
+
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class _CertsResponse:
+    """Minimal google.auth.transport.Response for cached cert payloads."""
+
+    def __init__(self, data: bytes, status: int = 200) -> None:
+        self.status = status
+        self.headers: Dict[str, str] = {}
+        self.data = data
+
+
+class CachingCertsRequest:
+    """google.auth transport that caches signing-cert responses.
+
+    Drop-in for ``grequests.Request()`` when passed to ``id_token`` helpers.
+    GET responses are kept for the ``Cache-Control: max-age`` the endpoint
+    sends and refreshed on a background thread shortly before they expire, so
+    logins normally never wait on the network. The underlying transport (and
+    its keep-alive session) is created once.
+
+    ``GOOGLE_CERTS_FILE`` serves certs (x509 map or JWKS) from a local file and
+    ``GOOGLE_CERTS_URL`` redirects fetches to a stand-in server, which keeps
+    login verification testable and benchmarkable offline.
+    """
+
+    def __init__(
+        self,
+        certs_file: Optional[str] = None,
+        certs_url: Optional[str] = None,
+        default_max_age: float = 3600.0,
+        refresh_margin: float = 300.0,
+    ) -> None:
+        self.certs_file = certs_file
+        self.certs_url = certs_url
+        self.default_max_age = default_max_age
+        self.refresh_margin = refresh_margin
+        # url -> (fetched_at, expires_at, body)
+        self._cache: Dict[str, Tuple[float, float, bytes]] = {}
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._transport = None
+        self.fetches = 0
+
+    def _get_transport(self):
+        if self._transport is None:
+            if grequests is None:  # pragma: no cover - optional dependency
+                raise RuntimeError("google-auth is not installed")
+            self._transport = grequests.Request()
+        return self._transport
+
+    def _fetch(self, url: str) -> Tuple[float, bytes]:
+        self.fetches += 1
+        if self.certs_file:
+            with open(self.certs_file, "rb") as fh:
+                data = fh.read()
+            return time.monotonic() + self.default_max_age, data
+        resp = self._get_transport()(self.certs_url or url, method="GET", timeout=10)
+        if resp.status != 200:
+            raise RuntimeError(f"Could not fetch certificates ({resp.status})")
+        max_age = self.default_max_age
+        cache_control = (resp.headers or {}).get("cache-control") or (resp.headers or {}).get("Cache-Control") or ""
+        m = _MAX_AGE_RE.search(cache_control)
+        if m:
+            max_age = float(m.group(1))
+        return time.monotonic() + max_age, resp.data
+
+    def _store(self, url: str) -> bytes:
+        expires_at, data = self._fetch(url)
+        json.loads(data.decode("utf-8"))  # reject garbage before caching it
+        with self._lock:
+            self._cache[url] = (time.monotonic(), expires_at, data)
+        return data
+
+    def _refresh_in_background(self, url: str) -> None:
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def run() -> None:
+            try:
+                self._store(url)
+            except Exception:
+                # Keep serving the cached certs; the next call retries
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=run, name="google-certs-refresh", daemon=True).start()
+
+    def get(self, url: str) -> bytes:
+        now = time.monotonic()
+        with self._lock:
+            item = self._cache.get(url)
+        if item is not None:
+            _, expires_at, data = item
+            if now < expires_at:
+                if expires_at - now < self.refresh_margin:
+                    self._refresh_in_background(url)
+                return data
+        try:
+            return self._store(url)
+        except Exception:
+            if item is not None:
+                # Upstream is down: stale certs beat failing every login
+                return item[2]
+            raise
+
+    def invalidate(self, min_age: float = 0.0) -> bool:
+        """Drop cached certs fetched more than ``min_age`` seconds ago.
+
+        Returns True if anything was dropped. The age floor stops tokens with
+        made-up key ids from forcing a refetch on every login attempt.
+        """
+        cutoff = time.monotonic() - min_age
+        with self._lock:
+            stale = [url for url, (fetched_at, _, _) in self._cache.items() if fetched_at <= cutoff]
+            for url in stale:
+                del self._cache[url]
+        return bool(stale)
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if method != "GET":
+            return self._get_transport()(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+        return _CertsResponse(self.get(url))
+
+
+_CERTS_REQUEST: Optional[CachingCertsRequest] = None
+
+
+def get_certs_request() -> CachingCertsRequest:
+    """Process-wide cert cache, configured from env on first use."""
+    global _CERTS_REQUEST
+    if _CERTS_REQUEST is None:
+        _CERTS_REQUEST = CachingCertsRequest(
+            certs_file=os.getenv("GOOGLE_CERTS_FILE") or None,
+            certs_url=os.getenv("GOOGLE_CERTS_URL") or None,
+            default_max_age=float(os.getenv("GOOGLE_CERTS_MAX_AGE", "3600")),
+        )
+    return _CERTS_REQUEST
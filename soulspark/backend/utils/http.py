@@ -0,0 +1,135 @@
+"""Shared outbound HTTP client with retries and per-upstream circuit breakers."""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from typing import Dict, Optional
+
+import httpx
+
+
+class UpstreamError(Exception):
+    """An upstream call failed, or was skipped because its circuit is open."""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures.
+
+    Opens after ``failure_threshold`` consecutive failures; while open every
+    call is refused for ``reset_timeout`` seconds. After that one probe call
+    is let through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def abandon(self) -> None:
+        """The call was cancelled before it had an outcome; free the probe slot."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, object]:
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """App-lifetime client: pooled keep-alive connections, short connect timeout."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                float(os.getenv("HTTP_READ_TIMEOUT", "5")),
+                connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", "2")),
+            ),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+            headers={"User-Agent": "soulspark/1.0"},
+        )
+    return _CLIENT
+
+
+async def close_http_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+async def get_text(
+    url: str,
+    breaker: Optional[CircuitBreaker] = None,
+    retries: int = 2,
+    backoff: float = 0.25,
+) -> str:
+    """GET ``url`` and return the body, retrying transport errors and 5xx.
+
+    Waits ``backoff * 2**attempt`` (with jitter) between attempts. Each
+    attempt counts against ``breaker``; raises UpstreamError when all fail or
+    the circuit is open.
+    """
+    last: Optional[BaseException] = None
+    for attempt in range(retries + 1):
+        if breaker is not None and not breaker.allow():
+            raise UpstreamError(f"{breaker.name} circuit open") from last
+        try:
+            resp = await get_http_client().get(url)
+        except httpx.HTTPError as e:
+            last = e
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.abandon()
+            raise
+        else:
+            if resp.status_code == 200:
+                if breaker is not None:
+                    breaker.record_success()
+                return resp.text
+            last = UpstreamError(f"upstream returned {resp.status_code}")
+            if resp.status_code < 500:
+                # Client errors won't fix themselves on retry
+                if breaker is not None:
+                    breaker.record_failure()
+                raise last
+        if breaker is not None:
+            breaker.record_failure()
+        if attempt < retries:
+            await asyncio.sleep(backoff * (2**attempt) * (0.5 + random.random()))
+    raise UpstreamError(f"request failed after {retries + 1} attempts: {last!r}") from last
@@ -0,0 +1,230 @@
+"""ETags, conditional requests and response compression."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+import anyio.to_thread
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore
+
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def weak_etag(*parts: object) -> str:
+    """Validator for a response derived from ``parts``, without rendering it.
+
+    Weak because the same data may go out under different content codings
+    (see CompressionMiddleware).
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+        h.update(b"\x1f")
+    return 'W/"' + h.hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header covers ``etag`` (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Content codings from an Accept-Encoding header with their q-values."""
+    out: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[name.strip().lower()] = q
+    return out
+
+
+def not_modified(etag: str, cache_control: str, headers: Optional[Mapping[str, str]] = None) -> Response:
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag, "Cache-Control": cache_control})
+
+
+@dataclass
+class Precompressed:
+    """A response body encoded once, with every variant ready to send.
+
+    Each coding has its own strong ETag, since they are different bytes.
+    """
+
+    body: bytes
+    media_type: str = "application/json"
+    variants: Dict[str, bytes] = field(default_factory=dict)
+    etags: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def render(cls, body: bytes, media_type: str = "application/json") -> "Precompressed":
+        variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=11)
+        etags = {"identity": strong_etag(body)}
+        etags.update((coding, strong_etag(data)) for coding, data in variants.items())
+        return cls(body=body, media_type=media_type, variants=variants, etags=etags)
+
+    def choose(self, accept_encoding: Optional[str]) -> str:
+        accepted = accepted_encodings(accept_encoding)
+        for coding in ("br", "gzip"):
+            if coding in self.variants and accepted.get(coding, 0) > 0:
+                return coding
+        return "identity"
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        """304 when the client's copy is current, else the best encoding it accepts."""
+        coding = self.choose(request.headers.get("accept-encoding"))
+        etag = self.etags[coding]
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag, cache_control, {"Vary": "Accept-Encoding"})
+        if coding == "identity":
+            return Response(content=self.body, media_type=self.media_type, headers=headers)
+        headers["Content-Encoding"] = coding
+        return Response(content=self.variants[coding], media_type=self.media_type, headers=headers)
+
+
+# Already compressed, or streamed to clients that must see each event at once
+_UNCOMPRESSED_TYPES = ("application/zip", "application/gzip", "application/x-gzip", "text/event-stream")
+_UNCOMPRESSED_PREFIXES = ("image/", "audio/", "video/", "font/")
+
+
+class _Encoder:
+    """Incremental gzip or brotli stream."""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int) -> None:
+        if coding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._br = None
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        # Flush every chunk so streamed responses reach the client as they are produced
+        if self._br is not None:
+            return self._br.process(data) + (self._br.finish() if final else self._br.flush())
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression (brotli when installed and accepted).
+
+    Passes through bodies under ``minimum_size``, responses that already carry
+    a Content-Encoding (e.g. the precompressed verse), 204/206/304 responses
+    and already-compressed or event-stream media types. Chunks of at least
+    ``thread_minimum_size`` bytes are compressed in a worker thread.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        brotli_quality: int = 5,
+        thread_minimum_size: int = 128 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+
+    def _coding(self, scope: Scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        if brotli is not None and accepted.get("br", 0) > 0:
+            return "br"
+        if accepted.get("gzip", 0) > 0:
+            return "gzip"
+        return None
+
+    @staticmethod
+    def _skip(message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return (
+            "content-encoding" in headers
+            or message["status"] in (204, 206, 304)
+            or media_type in _UNCOMPRESSED_TYPES
+            or media_type.startswith(_UNCOMPRESSED_PREFIXES)
+        )
+
+    async def _encode(self, encoder: _Encoder, data: bytes, final: bool) -> bytes:
+        if len(data) >= self.thread_minimum_size:
+            return await anyio.to_thread.run_sync(encoder.encode, data, final)
+        return encoder.encode(data, final)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        coding = self._coding(scope) if scope["type"] == "http" else None
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None  # held until the first body chunk decides
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                if self._skip(message):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                encoder = _Encoder(coding, self.compresslevel, self.brotli_quality)
+                message["body"] = await self._encode(encoder, body, not more_body)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(message["body"]))
+                await send(start)
+                start = None
+                await send(message)
+                return
+            message["body"] = await self._encode(encoder, body, not more_body)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
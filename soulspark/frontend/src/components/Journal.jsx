@@ -1,5 +1,5 @@
 import { useEffect, useState, useRef } from 'react'
-import { listJournal, createJournal, deleteJournal, askJournal, updateJournal } from '../utils/api'
+import { listJournalPage, createJournal, deleteJournal, askJournal, askJournalStream, updateJournal } from '../utils/api'
 import { motion, AnimatePresence } from 'framer-motion'
 import { fadeInUp, spring } from '../utils/anim'
 import dayjs from 'dayjs'
@@ -46,9 +46,25 @@ export default function Journal(){
   const [askAnswer, setAskAnswer] = useState('')
   const [askLoading, setAskLoading] = useState(false)
 
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+
   async function load(){
-    const data = await listJournal(true)
-    setEntries(data)
+    const { items, nextCursor } = await listJournalPage()
+    setEntries(items)
+    setNextCursor(nextCursor)
+  }
+
+  async function loadMore(){
+    if(!nextCursor || loadingMore) return
+    setLoadingMore(true)
+    try{
+      const page = await listJournalPage({ before: nextCursor })
+      setEntries(prev => [...prev, ...page.items])
+      setNextCursor(page.nextCursor)
+    }finally{
+      setLoadingMore(false)
+    }
   }
 
   useEffect(()=>{ load() },[])
@@ -106,11 +122,25 @@ export default function Journal(){
     const q = (askQuestion||'').trim()
     if(!q) return
     setAskLoading(true)
+    setAskAnswer('')
     try{
-      const { answer } = await askJournal(q, entryId)
-      setAskAnswer(answer)
+      let streamed = ''
+      const { answer } = await askJournalStream(q, entryId, (delta)=>{
+        streamed += delta
+        setAskAnswer(streamed)
+        setAskLoading(false)
+      }, (text)=>{
+        streamed = text
+        setAskAnswer(streamed)
+      })
+      setAskAnswer(answer || streamed)
     }catch(e){
-      setAskAnswer('Please try again in a moment.')
+      try{
+        const { answer } = await askJournal(q, entryId)
+        setAskAnswer(answer)
+      }catch(e2){
+        setAskAnswer('Please try again in a moment.')
+      }
     }finally{
       setAskLoading(false)
     }
@@ -230,6 +260,11 @@ export default function Journal(){
           </motion.div>
         ))}
         </AnimatePresence>
+        {nextCursor && (
+          <div className="flex justify-center">
+            <button type="button" onClick={loadMore} disabled={loadingMore} className={`btn btn-outline px-4 py-2 ${loadingMore? 'opacity-60 cursor-not-allowed' : ''}`}>{loadingMore? 'Loading...' : 'Load older entries'}</button>
+          </div>
+        )}
       </div>
     </div>
   )
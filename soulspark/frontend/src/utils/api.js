@@ -17,7 +17,13 @@ api.interceptors.request.use((config)=>{
 })
 
 export async function fetchTodayVerse() {
-  const { data } = await api.get('/verse/today')
+  // Ask for the verse of the user's local date, not the server's
+  let params = { utc_offset: -new Date().getTimezoneOffset() }
+  try {
+    const tz = Intl.DateTimeFormat().resolvedOptions().timeZone
+    if (tz) params = { tz }
+  } catch {}
+  const { data } = await api.get('/verse/today', { params })
   return data
 }
 
@@ -31,6 +37,15 @@ export async function listJournal(includePrivate=true) {
   return data
 }
 
+// One page of entries, newest first. Pass the returned nextCursor as `before`
+// to fetch older entries; nextCursor is null once the history is exhausted.
+export async function listJournalPage({ includePrivate=true, limit=30, before } = {}) {
+  const params = { include_private: includePrivate, limit }
+  if(before) params.before = before
+  const res = await api.get('/journal', { params })
+  return { items: res.data, nextCursor: res.headers['x-next-cursor'] || null }
+}
+
 export async function createJournal(entry) {
   const { data } = await api.post('/journal', entry)
   return data
@@ -57,4 +72,42 @@ export async function askJournal(question, entryId){
   return data
 }
 
+// Streams the answer via server-sent events; onDelta receives text as it arrives,
+// onReplace the full text so far when the server corrects what it already sent.
+// Resolves with the final { answer } (same shape as askJournal).
+export async function askJournalStream(question, entryId, onDelta, onReplace){
+  const body = entryId ? { question, entry_id: entryId } : { question }
+  const headers = { 'Content-Type': 'application/json', Accept: 'text/event-stream' }
+  const t = localStorage.getItem('manna_token')
+  if(t) headers.Authorization = `Bearer ${t}`
+  const res = await fetch(`${API_URL}/journal/ask/stream`, { method: 'POST', headers, body: JSON.stringify(body) })
+  if(!res.ok || !res.body) throw new Error(`Ask failed: ${res.status}`)
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buf = ''
+  let answer = ''
+  for(;;){
+    const { value, done } = await reader.read()
+    if(done) break
+    buf += decoder.decode(value, { stream: true })
+    let idx
+    while((idx = buf.indexOf('\n\n')) !== -1){
+      const frame = buf.slice(0, idx)
+      buf = buf.slice(idx + 2)
+      const event = (frame.match(/^event: (.*)$/m) || [])[1]
+      const data = (frame.match(/^data: (.*)$/m) || [])[1]
+      if(!data) continue
+      const payload = JSON.parse(data)
+      if(event === 'delta'){
+        onDelta && onDelta(payload.text)
+      }else if(event === 'replace'){
+        onReplace && onReplace(payload.text)
+      }else if(event === 'done'){
+        answer = payload.answer
+      }
+    }
+  }
+  return { answer }
+}
+
 // Mass readings removed for now